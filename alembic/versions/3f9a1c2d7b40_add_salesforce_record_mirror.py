@@ -0,0 +1,52 @@
+"""add_salesforce_record_mirror
+
+Revision ID: 3f9a1c2d7b40
+Revises: e5b527dd7adc
+Create Date: 2026-02-16 10:12:41.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b40'
+down_revision: Union[str, None] = 'e5b527dd7adc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('salesforce_records',
+    sa.Column('org_id', sa.UUID(), nullable=False),
+    sa.Column('sobject', sa.String(length=255), nullable=False),
+    sa.Column('record_id', sa.String(length=18), nullable=False),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('system_modstamp', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('org_id', 'sobject', 'record_id', name='uq_salesforce_records_org_sobject_record')
+    )
+    op.create_table('salesforce_sync_states',
+    sa.Column('org_id', sa.UUID(), nullable=False),
+    sa.Column('sobject', sa.String(length=255), nullable=False),
+    sa.Column('watermark', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('org_id', 'sobject', name='uq_salesforce_sync_states_org_sobject')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('salesforce_sync_states')
+    op.drop_table('salesforce_records')
@@ -0,0 +1,38 @@
+"""add_cache_entries
+
+Revision ID: 4b7e2a9c1f63
+Revises: f3a8c6e1d920
+Create Date: 2026-03-12 16:25:03.771420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a9c1f63'
+down_revision: Union[str, None] = 'f3a8c6e1d920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cache_entries',
+    sa.Column('namespace', sa.String(length=255), nullable=False),
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.LargeBinary(), nullable=False),
+    sa.Column('compressed', sa.Boolean(), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('namespace', 'key'),
+    prefixes=['UNLOGGED']
+    )
+    op.create_index('ix_cache_entries_expires_at', 'cache_entries', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cache_entries_expires_at', table_name='cache_entries')
+    op.drop_table('cache_entries')
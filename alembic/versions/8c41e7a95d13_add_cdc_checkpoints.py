@@ -0,0 +1,35 @@
+"""add_cdc_checkpoints
+
+Revision ID: 8c41e7a95d13
+Revises: 3f9a1c2d7b40
+Create Date: 2026-02-19 15:03:27.214870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e7a95d13'
+down_revision: Union[str, None] = '3f9a1c2d7b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cdc_checkpoints',
+    sa.Column('org_id', sa.UUID(), nullable=False),
+    sa.Column('channel', sa.String(length=255), nullable=False),
+    sa.Column('replay_id', sa.BigInteger(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('org_id', 'channel', name='uq_cdc_checkpoints_org_channel')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cdc_checkpoints')
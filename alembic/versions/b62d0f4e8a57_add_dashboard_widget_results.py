@@ -0,0 +1,44 @@
+"""add_dashboard_widget_results
+
+Revision ID: b62d0f4e8a57
+Revises: 8c41e7a95d13
+Create Date: 2026-02-23 11:47:09.361552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b62d0f4e8a57'
+down_revision: Union[str, None] = '8c41e7a95d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dashboard_widget_results',
+    sa.Column('dashboard_id', sa.UUID(), nullable=False),
+    sa.Column('org_id', sa.UUID(), nullable=False),
+    sa.Column('widget_id', sa.String(length=255), nullable=False),
+    sa.Column('definition_hash', sa.String(length=64), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('rows', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('source_watermark', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['dashboard_id'], ['saved_configs.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['org_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('dashboard_id', 'widget_id', name='uq_dashboard_widget_results_dashboard_widget')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_widget_results')
@@ -0,0 +1,32 @@
+"""add_connection_health_columns
+
+Revision ID: f3a8c6e1d920
+Revises: d19e3b7c2f05
+Create Date: 2026-03-09 14:12:40.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c6e1d920'
+down_revision: Union[str, None] = 'd19e3b7c2f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('salesforce_connections', sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('salesforce_connections', sa.Column('last_check_status', sa.String(length=20), nullable=True))
+    op.add_column('salesforce_connections', sa.Column('last_check_latency_ms', sa.Float(), nullable=True))
+    op.add_column('salesforce_connections', sa.Column('last_check_error', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('salesforce_connections', 'last_check_error')
+    op.drop_column('salesforce_connections', 'last_check_latency_ms')
+    op.drop_column('salesforce_connections', 'last_check_status')
+    op.drop_column('salesforce_connections', 'last_checked_at')
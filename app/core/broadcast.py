@@ -0,0 +1,85 @@
+"""
+In-memory fan-out of job progress events.
+
+Every API process subscribes once to the job progress NOTIFY channel via the
+shared listener connection; events are then routed to per-client bounded
+queues. A slow client never blocks others: when its queue is full the oldest
+event is dropped (progress events supersede each other anyway).
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+
+from app.core.config import settings
+from app.core.jobs import JOB_PROGRESS_CHANNEL
+from app.core.notify import pg_listener
+
+logger = logging.getLogger(__name__)
+
+# Queued to every subscriber after the listener reconnects: events may have
+# been missed, so the stream should re-read the job row.
+RESYNC = {"type": "resync"}
+
+
+class DropOldestQueue:
+    """Bounded single-consumer queue that discards the oldest item when full."""
+
+    def __init__(self, maxsize: int):
+        self._items: deque = deque(maxlen=maxsize)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def put_nowait(self, item) -> None:
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+        self._items.append(item)
+        self._ready.set()
+
+    async def get(self):
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+
+class JobProgressHub:
+    def __init__(self):
+        self._subscribers: dict[str, set[DropOldestQueue]] = {}
+        self._listening = False
+
+    async def subscribe(self, job_id: str) -> DropOldestQueue:
+        if not self._listening:
+            self._listening = True
+            await pg_listener.subscribe(JOB_PROGRESS_CHANNEL, self._on_notify)
+            pg_listener.on_reconnect(self._on_reconnect)
+
+        queue = DropOldestQueue(settings.sse_queue_size)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: DropOldestQueue) -> None:
+        queues = self._subscribers.get(job_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[job_id]
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed job progress payload: %r", payload[:200])
+            return
+        for queue in self._subscribers.get(event.get("job_id"), ()):
+            queue.put_nowait(event)
+
+    def _on_reconnect(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(RESYNC)
+
+
+job_progress_hub = JobProgressHub()
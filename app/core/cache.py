@@ -0,0 +1,70 @@
+"""
+In-process TTL caches.
+
+Entries are grouped by namespace (e.g. "records:<org_id>:<sobject>") so that a
+single change event can drop every cached result it affects.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry expiry and namespace invalidation."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[tuple[str, Hashable], tuple[float, Any]] = OrderedDict()
+        self._namespaces: dict[str, set[Hashable]] = {}
+
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get((namespace, key), _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._discard(namespace, key)
+            return default
+        self._data.move_to_end((namespace, key))
+        return value
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[(namespace, key)] = (expires_at, value)
+        self._data.move_to_end((namespace, key))
+        self._namespaces.setdefault(namespace, set()).add(key)
+        while len(self._data) > self.maxsize:
+            (old_ns, old_key), _ = self._data.popitem(last=False)
+            self._forget(old_ns, old_key)
+
+    def invalidate(self, namespace: str) -> int:
+        """Drop every entry in a namespace. Returns the number removed."""
+        keys = self._namespaces.pop(namespace, set())
+        for key in keys:
+            self._data.pop((namespace, key), None)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._namespaces.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _discard(self, namespace: str, key: Hashable) -> None:
+        self._data.pop((namespace, key), None)
+        self._forget(namespace, key)
+
+    def _forget(self, namespace: str, key: Hashable) -> None:
+        keys = self._namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._namespaces[namespace]
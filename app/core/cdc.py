@@ -0,0 +1,489 @@
+"""
+Salesforce Change Data Capture subscriber.
+
+One long-running task per connected org reads change events from an
+EventSource into a bounded buffer. A separate applier drains the buffer in
+batches, updates the local record mirror, checkpoints the replay id in the
+same transaction, and invalidates cached query results for the touched
+sobjects. When the source drops, the buffer is drained before reconnecting
+from the stored checkpoint, so delivery is at-least-once and in order.
+"""
+
+import asyncio
+import contextlib
+import logging
+import random
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.connections import load_salesforce_connection, refresh_salesforce_connection
+from app.core.database import async_session_factory
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import SF_RETRIES
+from app.core.records import records_cache_namespace
+from app.core.salesforce import build_http_client
+from app.models.cdc_checkpoint import CdcCheckpoint
+from app.models.salesforce_connection import SalesforceConnection
+from app.models.salesforce_record import SalesforceRecord, SalesforceSyncState
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChangeEvent:
+    replay_id: int
+    sobject: str
+    change_type: str  # CREATE, UPDATE, DELETE, UNDELETE, GAP_*
+    record_ids: list[str]
+    fields: dict = field(default_factory=dict)
+    commit_timestamp: datetime | None = None
+
+    @classmethod
+    def from_payload(cls, replay_id: int, payload: dict) -> "ChangeEvent":
+        """Build from a CDC event payload (ChangeEventHeader + changed field values)."""
+        header = payload.get("ChangeEventHeader", {})
+        commit_ms = header.get("commitTimestamp")
+
+        # Compound fields (Name, addresses) arrive nested; mirror them flat like REST does
+        fields: dict = {}
+        for key, value in payload.items():
+            if key == "ChangeEventHeader":
+                continue
+            if isinstance(value, dict):
+                fields.update({k: v for k, v in value.items() if v is not None})
+            else:
+                fields[key] = value
+
+        return cls(
+            replay_id=int(replay_id),
+            sobject=header.get("entityName", ""),
+            change_type=header.get("changeType", ""),
+            record_ids=list(header.get("recordIds", [])),
+            fields=fields,
+            commit_timestamp=(
+                datetime.fromtimestamp(commit_ms / 1000, tz=timezone.utc) if commit_ms else None
+            ),
+        )
+
+
+class EventSource(ABC):
+    """A reconnectable stream of change events for one org."""
+
+    @abstractmethod
+    async def connect(self, replay_id: int | None) -> None:
+        """Open the stream, resuming after replay_id (None = new events only)."""
+
+    @abstractmethod
+    def events(self) -> AsyncIterator[ChangeEvent]:
+        """Yield events until the stream fails or closes."""
+
+    async def close(self) -> None:
+        pass
+
+
+# --- Offline fake source ---
+
+
+class FakeEventSource(EventSource):
+    """
+    In-memory event source for offline testing.
+    Keeps a replayable log shared across reconnects; call publish() to emit
+    events and fail() to simulate a dropped connection.
+    """
+
+    def __init__(self):
+        self.log: list[ChangeEvent] = []
+        self._position = 0
+        self._failure: Exception | None = None
+        self._changed = asyncio.Event()
+
+    def publish(
+        self,
+        sobject: str,
+        change_type: str,
+        record_ids: list[str],
+        fields: dict | None = None,
+        commit_timestamp: datetime | None = None,
+    ) -> ChangeEvent:
+        event = ChangeEvent(
+            replay_id=len(self.log) + 1,
+            sobject=sobject,
+            change_type=change_type,
+            record_ids=record_ids,
+            fields=fields or {},
+            commit_timestamp=commit_timestamp or datetime.now(timezone.utc),
+        )
+        self.log.append(event)
+        self._changed.set()
+        return event
+
+    def fail(self, exc: Exception | None = None) -> None:
+        self._failure = exc or ConnectionError("Fake event source disconnected")
+        self._changed.set()
+
+    async def connect(self, replay_id: int | None) -> None:
+        self._failure = None
+        self._position = len(self.log) if replay_id is None else max(0, min(replay_id, len(self.log)))
+
+    async def events(self) -> AsyncIterator[ChangeEvent]:
+        while True:
+            if self._failure is not None:
+                failure, self._failure = self._failure, None
+                raise failure
+            if self._position < len(self.log):
+                event = self.log[self._position]
+                self._position += 1
+                yield event
+                continue
+            self._changed.clear()
+            await self._changed.wait()
+
+
+_fake_sources: dict[uuid.UUID, FakeEventSource] = {}
+
+
+def get_fake_event_source(org_id: uuid.UUID) -> FakeEventSource:
+    """Return the process-wide fake source for an org, creating it on first use."""
+    if org_id not in _fake_sources:
+        _fake_sources[org_id] = FakeEventSource()
+    return _fake_sources[org_id]
+
+
+# --- Salesforce Streaming API (CometD long-polling) source ---
+
+
+class CometDEventSource(EventSource):
+    """
+    Subscribes to a CDC channel over the Streaming API's Bayeux/CometD
+    long-polling transport, using the replay extension to resume.
+    """
+
+    def __init__(self, org_id: uuid.UUID, channel: str | None = None):
+        self.org_id = org_id
+        self.channel = channel or settings.cdc_channel
+        self._client: httpx.AsyncClient | None = None
+        self._url = ""
+        self._client_id: str | None = None
+
+    async def connect(self, replay_id: int | None) -> None:
+        async with async_session_factory() as db:
+            sf_conn = await load_salesforce_connection(db, self.org_id)
+            if sf_conn is None:
+                raise LookupError(f"No Salesforce connection for org {self.org_id}")
+
+            # Long-poll connect requests are held open by Salesforce for ~110s
+            # Own client per subscription: CometD ties the session to cookies
+            self._client = build_http_client(timeout=httpx.Timeout(30.0, read=130.0))
+            self._url = f"{sf_conn.instance_url}/cometd/{settings.salesforce_api_version}"
+            self._client.headers["Authorization"] = f"Bearer {sf_conn.access_token}"
+
+            try:
+                handshake = await self._post(self._handshake_message())
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 401:
+                    raise
+                SF_RETRIES.labels("streaming", "token_expired").inc()
+                sf_conn = await refresh_salesforce_connection(db, sf_conn)
+                await db.commit()
+                self._url = f"{sf_conn.instance_url}/cometd/{settings.salesforce_api_version}"
+                self._client.headers["Authorization"] = f"Bearer {sf_conn.access_token}"
+                handshake = await self._post(self._handshake_message())
+
+        reply = handshake[0]
+        if not reply.get("successful"):
+            raise ConnectionError(f"CometD handshake failed: {reply.get('error')}")
+        self._client_id = reply["clientId"]
+
+        subscribed = await self._post([{
+            "channel": "/meta/subscribe",
+            "clientId": self._client_id,
+            "subscription": self.channel,
+            "ext": {"replay": {self.channel: -1 if replay_id is None else replay_id}},
+        }])
+        if not subscribed[0].get("successful"):
+            raise ConnectionError(f"CometD subscribe failed: {subscribed[0].get('error')}")
+
+    def _handshake_message(self) -> list[dict]:
+        return [{
+            "channel": "/meta/handshake",
+            "version": "1.0",
+            "supportedConnectionTypes": ["long-polling"],
+            "ext": {"replay": True},
+        }]
+
+    async def _post(self, messages: list[dict]) -> list[dict]:
+        response = await self._client.post(self._url, json=messages)
+        response.raise_for_status()
+        return response.json()
+
+    async def events(self) -> AsyncIterator[ChangeEvent]:
+        while True:
+            messages = await self._post([{
+                "channel": "/meta/connect",
+                "clientId": self._client_id,
+                "connectionType": "long-polling",
+            }])
+            for message in messages:
+                channel = message.get("channel", "")
+                if channel == "/meta/connect":
+                    if not message.get("successful"):
+                        raise ConnectionError(f"CometD connect failed: {message.get('error')}")
+                    continue
+                if channel.startswith("/data/") and "data" in message:
+                    data = message["data"]
+                    yield ChangeEvent.from_payload(data["event"]["replayId"], data["payload"])
+
+    async def close(self) -> None:
+        if self._client is None:
+            return
+        if self._client_id:
+            with contextlib.suppress(Exception):
+                await self._post([{"channel": "/meta/disconnect", "clientId": self._client_id}])
+        await self._client.aclose()
+        self._client = None
+
+
+def default_source_factory(org_id: uuid.UUID) -> EventSource:
+    if settings.cdc_source == "fake":
+        return get_fake_event_source(org_id)
+    return CometDEventSource(org_id)
+
+
+# --- Applying events ---
+
+
+async def load_checkpoint(org_id: uuid.UUID, channel: str) -> int | None:
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(CdcCheckpoint.replay_id).where(
+                CdcCheckpoint.org_id == org_id,
+                CdcCheckpoint.channel == channel,
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def _apply_event(db: AsyncSession, org_id: uuid.UUID, event: ChangeEvent) -> None:
+    scope = (
+        SalesforceRecord.org_id == org_id,
+        SalesforceRecord.sobject == event.sobject,
+        SalesforceRecord.record_id.in_(event.record_ids),
+    )
+
+    if event.change_type == "DELETE":
+        await db.execute(
+            update(SalesforceRecord)
+            .where(*scope)
+            .values(is_deleted=True, system_modstamp=event.commit_timestamp)
+        )
+    elif event.change_type == "UPDATE":
+        # Only patch rows already mirrored; unknown rows arrive with the next full sync
+        patch = bindparam("patch", event.fields, type_=JSONB)
+        await db.execute(
+            update(SalesforceRecord)
+            .where(*scope)
+            .values(data=SalesforceRecord.data.op("||")(patch), system_modstamp=event.commit_timestamp)
+        )
+    elif event.change_type in ("CREATE", "UNDELETE"):
+        stmt = insert(SalesforceRecord).values([
+            {
+                "org_id": org_id,
+                "sobject": event.sobject,
+                "record_id": record_id,
+                "data": {**event.fields, "Id": record_id},
+                "system_modstamp": event.commit_timestamp,
+                "is_deleted": False,
+            }
+            for record_id in event.record_ids
+        ])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_salesforce_records_org_sobject_record",
+                set_={
+                    "data": SalesforceRecord.data.op("||")(stmt.excluded.data),
+                    "system_modstamp": stmt.excluded.system_modstamp,
+                    "is_deleted": False,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+    else:
+        # GAP_* / overflow events carry no field data; the next full sync repairs them
+        logger.warning(
+            "CDC %s event for org %s %s %s; mirror may be stale until next sync",
+            event.change_type, org_id, event.sobject, event.record_ids,
+        )
+
+
+async def apply_events(org_id: uuid.UUID, channel: str, events: list[ChangeEvent]) -> set[str]:
+    """
+    Apply a batch of events to the mirror and advance the checkpoint atomically.
+    Only sobjects that already have a mirror are touched. Returns those sobjects.
+    """
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(SalesforceSyncState.sobject).where(
+                SalesforceSyncState.org_id == org_id,
+                SalesforceSyncState.sobject.in_({e.sobject for e in events}),
+            )
+        )
+        mirrored = set(result.scalars())
+
+        watermarks: dict[str, datetime | None] = {}
+        for event in events:
+            if event.sobject not in mirrored:
+                continue
+            await _apply_event(db, org_id, event)
+            previous = watermarks.get(event.sobject)
+            if event.commit_timestamp and (previous is None or event.commit_timestamp > previous):
+                watermarks[event.sobject] = event.commit_timestamp
+            else:
+                watermarks.setdefault(event.sobject, previous)
+
+        now = datetime.now(timezone.utc)
+        for sobject, watermark in watermarks.items():
+            values = {"last_synced_at": now}
+            if watermark is not None:
+                values["watermark"] = func.greatest(
+                    func.coalesce(SalesforceSyncState.watermark, watermark), watermark
+                )
+            await db.execute(
+                update(SalesforceSyncState)
+                .where(SalesforceSyncState.org_id == org_id, SalesforceSyncState.sobject == sobject)
+                .values(**values)
+            )
+
+        checkpoint = insert(CdcCheckpoint).values(
+            org_id=org_id, channel=channel, replay_id=events[-1].replay_id
+        )
+        await db.execute(
+            checkpoint.on_conflict_do_update(
+                constraint="uq_cdc_checkpoints_org_channel",
+                set_={"replay_id": checkpoint.excluded.replay_id, "updated_at": func.now()},
+            )
+        )
+        for sobject in watermarks:
+            await invalidation_bus.publish(db, "records", records_cache_namespace(org_id, sobject))
+        await db.commit()
+
+    return set(watermarks)
+
+
+# --- Subscriber tasks ---
+
+
+class OrgSubscriber:
+    """Reader + applier pair for one org, with reconnect/backoff."""
+
+    def __init__(
+        self,
+        org_id: uuid.UUID,
+        source_factory: Callable[[uuid.UUID], EventSource] = default_source_factory,
+        channel: str | None = None,
+    ):
+        self.org_id = org_id
+        self.channel = channel or settings.cdc_channel
+        self._source_factory = source_factory
+        self._buffer: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=settings.cdc_buffer_size)
+
+    async def run(self) -> None:
+        applier = asyncio.create_task(self._apply_loop())
+        try:
+            await self._read_loop()
+        finally:
+            applier.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await applier
+
+    async def _read_loop(self) -> None:
+        backoff = settings.cdc_backoff_initial_seconds
+        while True:
+            source = self._source_factory(self.org_id)
+            try:
+                await source.connect(await load_checkpoint(self.org_id, self.channel))
+                async for event in source.events():
+                    # Blocks when the buffer is full, pushing back on the source
+                    await self._buffer.put(event)
+                    backoff = settings.cdc_backoff_initial_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("CDC stream for org %s dropped", self.org_id, exc_info=True)
+            finally:
+                with contextlib.suppress(Exception):
+                    await source.close()
+
+            # Resume from the checkpoint only after everything buffered is applied
+            await self._buffer.join()
+            SF_RETRIES.labels("streaming", "reconnect").inc()
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+            backoff = min(backoff * 2, settings.cdc_backoff_max_seconds)
+
+    async def _apply_loop(self) -> None:
+        while True:
+            batch = [await self._buffer.get()]
+            while len(batch) < settings.cdc_batch_size:
+                try:
+                    batch.append(self._buffer.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            backoff = settings.cdc_backoff_initial_seconds
+            while True:
+                try:
+                    await apply_events(self.org_id, self.channel, batch)
+                    break
+                except Exception:
+                    logger.exception("Failed to apply %d CDC events for org %s", len(batch), self.org_id)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, settings.cdc_backoff_max_seconds)
+
+            for _ in batch:
+                self._buffer.task_done()
+
+
+class CDCManager:
+    """Runs one OrgSubscriber per connected org and picks up new connections periodically."""
+
+    def __init__(self, source_factory: Callable[[uuid.UUID], EventSource] = default_source_factory):
+        self._source_factory = source_factory
+        self._subscribers: dict[uuid.UUID, asyncio.Task] = {}
+        self._supervisor: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        tasks = list(self._subscribers.values())
+        if self._supervisor is not None:
+            tasks.append(self._supervisor)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._subscribers.clear()
+
+    async def _supervise(self) -> None:
+        while True:
+            try:
+                async with async_session_factory() as db:
+                    result = await db.execute(select(SalesforceConnection.org_id).distinct())
+                    org_ids = set(result.scalars())
+
+                for org_id in org_ids - self._subscribers.keys():
+                    subscriber = OrgSubscriber(org_id, self._source_factory)
+                    self._subscribers[org_id] = asyncio.create_task(subscriber.run())
+                for org_id in self._subscribers.keys() - org_ids:
+                    self._subscribers.pop(org_id).cancel()
+            except Exception:
+                logger.exception("CDC supervisor failed to refresh subscriptions")
+
+            await asyncio.sleep(settings.cdc_rescan_interval_seconds)
@@ -30,9 +30,91 @@ class Settings(BaseSettings):
 
     # Encryption key for tokens at rest (Fernet)
     encryption_key: str = ""
+    encryption_retired_keys: list[str] = []  # still accepted for decryption during a rotation
 
     # App secret for state signing etc.
     app_secret: str = "change-me-in-production"
 
+    # Admin API (X-Admin-Token); admin endpoints are disabled while empty
+    admin_token: str = ""
+
+    # Local record mirror queries
+    records_default_page_size: int = 50
+    records_max_page_size: int = 500
+    records_cache_size: int = 2048
+    records_cache_ttl_seconds: float = 30.0
+
+    # In-process caches for the request path (kept coherent across workers via NOTIFY)
+    org_cache_size: int = 10000
+    org_cache_ttl_seconds: float = 300.0
+    connection_cache_size: int = 10000
+    connection_cache_ttl_seconds: float = 300.0
+
+    # Shared result cache: in-memory tier over an UNLOGGED Postgres table (app.core.shared_cache)
+    shared_cache_memory_size: int = 2000
+    shared_cache_memory_ttl_seconds: float = 30.0  # memory tier; entries also expire with the shared copy
+    shared_cache_max_bytes: int = 512 * 1024 * 1024  # sweeper evicts soonest-expiring entries beyond this
+    shared_cache_sweep_interval_seconds: float = 60.0
+    shared_cache_lock_wait_seconds: float = 30.0  # wait for another process computing the same key
+    shared_cache_compress_min_bytes: int = 1024
+    soql_cache_ttl_seconds: float = 300.0
+
+    # Salesforce API
+    salesforce_api_version: str = "62.0"
+    salesforce_max_connections: int = 100  # shared HTTP client pool size
+    health_check_concurrency: int = 20  # default for POST /admin/salesforce/health-check
+
+    # Dashboards
+    dashboard_default_widget_ttl_seconds: int = 300
+    dashboard_widget_row_limit: int = 200
+    dashboard_eval_concurrency: int = 4
+
+    # Job queue / workers
+    worker_in_process: bool = False  # run the worker pool inside the API process
+    worker_concurrency: int = 4
+    job_visibility_timeout_seconds: int = 300
+    job_max_attempts: int = 5
+    job_retry_backoff_seconds: float = 10.0
+    job_retry_backoff_max_seconds: float = 900.0
+    job_poll_interval_seconds: float = 30.0  # fallback when no NOTIFY arrives
+
+    # Token re-encryption after a key rotation
+    reencrypt_batch_size: int = 200
+    reencrypt_max_rows_per_second: float = 500.0
+
+    # Server-Sent Events progress streams
+    sse_queue_size: int = 32
+    sse_keepalive_seconds: float = 15.0
+
+    # Metrics
+    metrics_enabled: bool = True  # expose GET /metrics
+    timing_sample_rate: float = 0.0  # fraction of requests with Server-Timing + a JSON timing log line
+
+    # Event loop monitoring
+    loop_monitor_enabled: bool = True
+    loop_lag_interval_ms: float = 100.0
+    loop_stall_threshold_ms: float = 250.0  # capture the blocking stack past this
+
+    # Offload CPU-bound helpers (bulk token crypto, large JSON parsing) to threads
+    cpu_offload_enabled: bool = False
+    cpu_offload_workers: int = 4
+    cpu_offload_min_batch: int = 8  # smaller token batches run inline
+    cpu_offload_json_min_bytes: int = 262144
+
+    # Request profiling (also triggered per request by `X-Profile: <admin_token>`)
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 5.0
+    profile_buffer_size: int = 50
+
+    # Change Data Capture subscriber
+    cdc_enabled: bool = False
+    cdc_source: str = "cometd"  # "cometd" or "fake" (offline testing)
+    cdc_channel: str = "/data/ChangeEvents"
+    cdc_buffer_size: int = 1000
+    cdc_batch_size: int = 200
+    cdc_backoff_initial_seconds: float = 1.0
+    cdc_backoff_max_seconds: float = 60.0
+    cdc_rescan_interval_seconds: float = 300.0
+
 
 settings = Settings()
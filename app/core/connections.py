@@ -0,0 +1,115 @@
+"""
+Salesforce connection loading and token refresh, independent of FastAPI.
+
+Request dependencies wrap these in HTTPExceptions; background tasks
+(CDC subscribers, workers) call them directly.
+"""
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.encryption import decrypt_tokens, encrypt_token
+from app.core.invalidation import invalidation_bus
+from app.core.salesforce import refresh_access_token
+from app.core.timing import span
+from app.models.salesforce_connection import SalesforceConnection
+
+
+# Decrypted connections for the request path, keyed by org; dropped in every
+# process when a token refresh or re-authorization commits
+connection_cache = invalidation_bus.register("connections", TTLCache(
+    maxsize=settings.connection_cache_size,
+    ttl=settings.connection_cache_ttl_seconds,
+))
+
+
+def connection_cache_namespace(org_id: uuid.UUID) -> str:
+    return f"connections:{org_id}"
+
+
+class SalesforceTokenRefreshError(Exception):
+    """Refreshing the access token failed; the user may need to re-authorize."""
+
+
+@dataclass
+class DecryptedSalesforceConnection:
+    """Holds decrypted tokens + connection metadata, never serialized to a response."""
+
+    id: uuid.UUID
+    org_id: uuid.UUID
+    access_token: str  # plaintext
+    refresh_token: str  # plaintext
+    instance_url: str
+    salesforce_org_id: str | None
+
+
+async def load_salesforce_connection(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+) -> DecryptedSalesforceConnection | None:
+    """
+    Load and decrypt the Salesforce connection for an org.
+    Returns None if no connection exists. Raises ValueError if decryption fails.
+    """
+    with span("db_connection"):
+        result = await db.execute(
+            select(SalesforceConnection).where(SalesforceConnection.org_id == org_id)
+        )
+    conn = result.scalar_one_or_none()
+    if conn is None:
+        return None
+
+    with span("decrypt"):
+        access_token, refresh_token = await decrypt_tokens([conn.access_token, conn.refresh_token])
+
+    return DecryptedSalesforceConnection(
+        id=conn.id,
+        org_id=conn.org_id,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        instance_url=conn.instance_url,
+        salesforce_org_id=conn.salesforce_org_id,
+    )
+
+
+async def refresh_salesforce_connection(
+    db: AsyncSession,
+    sf_conn: DecryptedSalesforceConnection,
+) -> DecryptedSalesforceConnection:
+    """
+    Refresh the access token using the stored refresh token.
+    Updates the DB row (flush only) and returns a connection with the fresh token.
+    """
+    try:
+        token_data = await refresh_access_token(sf_conn.refresh_token)
+    except Exception as e:
+        raise SalesforceTokenRefreshError(f"Failed to refresh Salesforce token: {e}.") from e
+
+    new_access_token = token_data.get("access_token")
+    if not new_access_token:
+        raise SalesforceTokenRefreshError("Salesforce returned no access token on refresh.")
+
+    with span("db_token_update"):
+        result = await db.execute(
+            select(SalesforceConnection).where(SalesforceConnection.id == sf_conn.id)
+        )
+        conn = result.scalar_one()
+        with span("encrypt"):
+            conn.access_token = encrypt_token(new_access_token)
+        conn.instance_url = token_data.get("instance_url", sf_conn.instance_url)
+        await db.flush()
+    await invalidation_bus.publish(db, "connections", connection_cache_namespace(sf_conn.org_id))
+
+    return DecryptedSalesforceConnection(
+        id=sf_conn.id,
+        org_id=sf_conn.org_id,
+        access_token=new_access_token,
+        refresh_token=sf_conn.refresh_token,
+        instance_url=conn.instance_url,
+        salesforce_org_id=sf_conn.salesforce_org_id,
+    )
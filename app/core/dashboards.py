@@ -0,0 +1,508 @@
+"""
+Dashboard widget evaluation.
+
+Each widget in a `config_type="dashboard"` SavedConfig compiles to a single
+aggregate query: SOQL GROUP BY against Salesforce, or the equivalent SQL over
+the local record mirror when one exists. Widgets are evaluated concurrently and
+materialized in `dashboard_widget_results` with a per-widget TTL, so opening a
+dashboard is one indexed read; only missing or expired widgets are recomputed.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from httpx import HTTPStatusError
+from sqlalchemy import Select, func, literal_column, not_, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.connections import (
+    DecryptedSalesforceConnection,
+    load_salesforce_connection,
+    refresh_salesforce_connection,
+)
+from app.core.database import async_session_factory
+from app.core.metrics import SF_RETRIES
+from app.core.records import (
+    FilterClause,
+    RecordQueryError,
+    compile_filter,
+    field_expression,
+    parse_filter,
+    validate_name,
+)
+from app.core.salesforce import query_org, soql_quote
+from app.models.dashboard_widget_result import DashboardWidgetResult
+from app.models.salesforce_record import SalesforceRecord, SalesforceSyncState
+from app.models.saved_config import SavedConfig
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_CONFIG_TYPE = "dashboard"
+AGGREGATES = {"count", "count_distinct", "sum", "avg", "min", "max"}
+WIDGET_FIELD_TYPES = {"text", "numeric", "boolean", "date"}
+WIDGET_SOURCES = {"auto", "soql", "mirror"}
+
+# Failed widgets are retried sooner than their normal TTL
+ERROR_TTL_SECONDS = 60
+
+# SOQL date filter values: ISO dates/datetimes, or date literals such as
+# TODAY, LAST_MONTH and LAST_N_DAYS:30 (relative, so SOQL-only)
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2}))?")
+_DATE_LITERAL_RE = re.compile(r"[A-Z_]+(:\d+)?")
+
+
+class WidgetDefinitionError(ValueError):
+    """Raised when a widget in config_data cannot be compiled."""
+
+
+@dataclass(frozen=True)
+class Widget:
+    """
+    Parsed widget definition. In config_data:
+
+        {"widgets": [{"id": "pipeline", "sobject": "Opportunity",
+                      "aggregate": "sum", "field": "Amount",
+                      "group_by": ["StageName"], "filters": ["IsClosed:eq:false"],
+                      "field_types": {"IsClosed": "boolean"}, "ttl_seconds": 300}]}
+    """
+
+    id: str
+    sobject: str
+    aggregate: str
+    field: str | None
+    group_by: tuple[str, ...]
+    filters: tuple[FilterClause, ...]
+    field_types: tuple[tuple[str, str], ...]
+    source: str
+    ttl_seconds: int
+    limit: int
+    definition_hash: str
+
+    def field_type(self, field: str) -> str:
+        return dict(self.field_types).get(field, "text")
+
+    def has_date_literals(self) -> bool:
+        """Whether a date filter uses a SOQL date literal, which the mirror can't evaluate."""
+        for clause in self.filters:
+            if self.field_type(clause.field) != "date" or clause.value is None:
+                continue
+            values = clause.value if isinstance(clause.value, tuple) else (clause.value,)
+            if any(_DATE_LITERAL_RE.fullmatch(v) for v in values):
+                return True
+        return False
+
+
+def _positive_int(raw: dict, key: str, default: int) -> int:
+    value = int(raw.get(key, default))
+    if value <= 0:
+        raise WidgetDefinitionError(f"{key} must be positive, got {value}")
+    return value
+
+
+def parse_widgets(config_data: dict) -> list[Widget]:
+    raw_widgets = config_data.get("widgets") or []
+    if not isinstance(raw_widgets, list):
+        raise WidgetDefinitionError("widgets must be a list")
+    widgets = []
+    for raw in raw_widgets:
+        try:
+            widget_id = str(raw["id"])
+            aggregate = raw.get("aggregate", "count")
+            field = raw.get("field")
+            if aggregate not in AGGREGATES:
+                raise WidgetDefinitionError(f"Unknown aggregate {aggregate!r}")
+            if aggregate != "count" and not field:
+                raise WidgetDefinitionError(f"Aggregate {aggregate!r} requires a field")
+
+            field_types = raw.get("field_types") or {}
+            for name, field_type in field_types.items():
+                validate_name(name)
+                if field_type not in WIDGET_FIELD_TYPES:
+                    raise WidgetDefinitionError(f"Unknown field type {field_type!r} for {name}")
+
+            source = raw.get("source", "auto")
+            if source not in WIDGET_SOURCES:
+                raise WidgetDefinitionError(f"Unknown source {source!r}")
+
+            widget = Widget(
+                id=widget_id,
+                sobject=validate_name(raw["sobject"], "sobject"),
+                aggregate=aggregate,
+                field=validate_name(field) if field else None,
+                group_by=tuple(validate_name(g) for g in raw.get("group_by") or []),
+                filters=tuple(parse_filter(f) for f in raw.get("filters") or []),
+                field_types=tuple(sorted(field_types.items())),
+                source=source,
+                ttl_seconds=_positive_int(raw, "ttl_seconds", settings.dashboard_default_widget_ttl_seconds),
+                limit=min(
+                    _positive_int(raw, "limit", settings.dashboard_widget_row_limit),
+                    settings.dashboard_widget_row_limit,
+                ),
+                definition_hash=hashlib.sha256(json.dumps(raw, sort_keys=True).encode()).hexdigest(),
+            )
+            if source == "mirror" and widget.has_date_literals():
+                raise WidgetDefinitionError("SOQL date literals can't be evaluated against the mirror")
+            widgets.append(widget)
+        except WidgetDefinitionError:
+            raise
+        except KeyError as e:
+            raise WidgetDefinitionError(f"Widget is missing required key {e}")
+        except RecordQueryError as e:
+            raise WidgetDefinitionError(str(e))
+        except (ValueError, TypeError, AttributeError) as e:
+            # Wrong types in the JSON (e.g. a non-numeric limit, a widget that isn't an object)
+            raise WidgetDefinitionError(f"Invalid widget definition: {e}")
+    return widgets
+
+
+# --- Compilation ---
+
+
+def _soql_literal(value: str, field_type: str) -> str:
+    if field_type in ("numeric", "boolean", "date"):
+        # Validated by coercion/format below rather than quoted
+        if field_type == "numeric":
+            try:
+                Decimal(value)
+            except ArithmeticError:
+                raise WidgetDefinitionError(f"Expected a number, got {value!r}")
+        elif field_type == "boolean" and value.lower() not in ("true", "false"):
+            raise WidgetDefinitionError(f"Expected true/false, got {value!r}")
+        elif field_type == "date" and not (_ISO_DATE_RE.fullmatch(value) or _DATE_LITERAL_RE.fullmatch(value)):
+            raise WidgetDefinitionError(f"Invalid date literal {value!r}")
+        return value
+    return soql_quote(value)
+
+
+def _soql_prefix_pattern(prefix: str) -> str:
+    r"""
+    Quoted LIKE pattern matching values that start with `prefix`. The value is
+    escaped once by soql_quote, then its wildcards are escaped for LIKE.
+
+    >>> _soql_prefix_pattern("50%_off\\x")
+    "'50\\%\\_off\\\\x%'"
+    """
+    quoted = soql_quote(prefix)[1:-1]
+    return "'" + quoted.replace("%", "\\%").replace("_", "\\_") + "%'"
+
+
+def _soql_condition(clause: FilterClause, field_type: str) -> str:
+    if clause.op == "null":
+        return f"{clause.field} = null"
+    if clause.op == "notnull":
+        return f"{clause.field} != null"
+    if clause.op == "in":
+        values = ", ".join(_soql_literal(v, field_type) for v in clause.value)
+        return f"{clause.field} IN ({values})"
+    if clause.op == "prefix":
+        return f"{clause.field} LIKE {_soql_prefix_pattern(clause.value)}"
+    operator = {"eq": "=", "ne": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}[clause.op]
+    return f"{clause.field} {operator} {_soql_literal(clause.value, field_type)}"
+
+
+def _soql_aggregate(widget: Widget) -> str:
+    if widget.aggregate == "count":
+        return f"COUNT({widget.field or 'Id'})"
+    if widget.aggregate == "count_distinct":
+        return f"COUNT_DISTINCT({widget.field})"
+    return f"{widget.aggregate.upper()}({widget.field})"
+
+
+def compile_soql(widget: Widget) -> str:
+    """Compile a widget into one SOQL aggregate query."""
+    aggregate = _soql_aggregate(widget)
+    select_list = ", ".join([*widget.group_by, f"{aggregate} metric"])
+    soql = f"SELECT {select_list} FROM {widget.sobject}"
+    if widget.filters:
+        soql += " WHERE " + " AND ".join(_soql_condition(f, widget.field_type(f.field)) for f in widget.filters)
+    if widget.group_by:
+        soql += f" GROUP BY {', '.join(widget.group_by)} ORDER BY {aggregate} DESC"
+    return f"{soql} LIMIT {widget.limit}"
+
+
+def _mirror_type(field_type: str) -> str:
+    # ISO-8601 dates compare correctly as text
+    return "text" if field_type == "date" else field_type
+
+
+def compile_mirror_sql(widget: Widget, org_id: uuid.UUID) -> Select:
+    """Compile a widget into the equivalent aggregate over salesforce_records."""
+    if widget.aggregate == "count":
+        metric = (
+            func.count(field_expression(widget.field))
+            if widget.field
+            else func.count(literal_column("*"))
+        )
+    elif widget.aggregate == "count_distinct":
+        metric = func.count(field_expression(widget.field).distinct())
+    elif widget.aggregate in ("sum", "avg"):
+        metric = getattr(func, widget.aggregate)(field_expression(widget.field, "numeric"))
+    else:
+        field_type = _mirror_type(widget.field_type(widget.field))
+        metric = getattr(func, widget.aggregate)(field_expression(widget.field, field_type))
+
+    groups = [field_expression(g, _mirror_type(widget.field_type(g))) for g in widget.group_by]
+    stmt = select(
+        *[expr.label(name) for expr, name in zip(groups, widget.group_by)],
+        metric.label("value"),
+    ).where(
+        SalesforceRecord.org_id == org_id,
+        SalesforceRecord.sobject == widget.sobject,
+        not_(SalesforceRecord.is_deleted),
+        *[compile_filter(f, _mirror_type(widget.field_type(f.field))) for f in widget.filters],
+    )
+    if groups:
+        stmt = stmt.group_by(*groups).order_by(metric.desc())
+    return stmt.limit(widget.limit)
+
+
+# --- Evaluation ---
+
+
+@dataclass
+class WidgetOutcome:
+    widget: Widget
+    source: str
+    rows: list[dict]
+    error: str | None = None
+    source_watermark: datetime | None = None
+
+
+class _SalesforceSession:
+    """
+    Shares one decrypted connection across concurrent widgets; refreshes at most once.
+    Query results go through the shared SOQL cache, so replicas refreshing the
+    same widgets run each query once; `refresh` bypasses it for forced recomputes.
+    """
+
+    def __init__(self, org_id: uuid.UUID, refresh: bool = False):
+        self.org_id = org_id
+        self.refresh = refresh
+        self._conn: DecryptedSalesforceConnection | None = None
+        self._lock = asyncio.Lock()
+
+    async def _get(self) -> DecryptedSalesforceConnection:
+        async with self._lock:
+            if self._conn is None:
+                async with async_session_factory() as db:
+                    self._conn = await load_salesforce_connection(db, self.org_id)
+                if self._conn is None:
+                    raise LookupError("No Salesforce connection found for this organization")
+            return self._conn
+
+    async def _refresh(self, stale: DecryptedSalesforceConnection) -> DecryptedSalesforceConnection:
+        async with self._lock:
+            # Another widget may already have refreshed while we waited
+            if self._conn is stale:
+                async with async_session_factory() as db:
+                    self._conn = await refresh_salesforce_connection(db, stale)
+                    await db.commit()
+            return self._conn
+
+    async def query(self, soql: str, ttl: float) -> list[dict]:
+        conn = await self._get()
+        try:
+            return await query_org(
+                self.org_id, conn.instance_url, conn.access_token, soql, cache_ttl=ttl, refresh=self.refresh
+            )
+        except HTTPStatusError as e:
+            if e.response.status_code != 401:
+                raise
+            SF_RETRIES.labels("query", "token_expired").inc()
+            conn = await self._refresh(conn)
+            return await query_org(
+                self.org_id, conn.instance_url, conn.access_token, soql, cache_ttl=ttl, refresh=self.refresh
+            )
+
+
+def _jsonable(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+async def evaluate_widget(
+    widget: Widget,
+    org_id: uuid.UUID,
+    sf: _SalesforceSession,
+    mirror_watermarks: dict[str, datetime | None],
+) -> WidgetOutcome:
+    use_mirror = widget.source == "mirror" or (
+        widget.source == "auto" and widget.sobject in mirror_watermarks and not widget.has_date_literals()
+    )
+    source = "mirror" if use_mirror else "soql"
+    try:
+        if use_mirror:
+            async with async_session_factory() as db:
+                result = await db.execute(compile_mirror_sql(widget, org_id))
+                rows = [{k: _jsonable(v) for k, v in row._mapping.items()} for row in result]
+            return WidgetOutcome(widget, source, rows, source_watermark=mirror_watermarks.get(widget.sobject))
+
+        records = await sf.query(compile_soql(widget), ttl=widget.ttl_seconds)
+        rows = [
+            {**{k: v for k, v in record.items() if k != "metric"}, "value": record.get("metric")}
+            for record in records
+        ]
+        return WidgetOutcome(widget, source, rows)
+    except Exception as e:
+        logger.warning("Dashboard widget %s failed: %s", widget.id, e)
+        return WidgetOutcome(widget, source, [], error=str(e))
+
+
+async def _mirror_watermarks(org_id: uuid.UUID, sobjects: set[str]) -> dict[str, datetime | None]:
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(SalesforceSyncState.sobject, SalesforceSyncState.watermark).where(
+                SalesforceSyncState.org_id == org_id,
+                SalesforceSyncState.sobject.in_(sobjects),
+            )
+        )
+        return {row.sobject: row.watermark for row in result}
+
+
+async def refresh_widgets(
+    org_id: uuid.UUID,
+    dashboard_id: uuid.UUID,
+    widgets: list[Widget],
+    existing: dict[str, DashboardWidgetResult] | None = None,
+    force: bool = False,
+) -> list[DashboardWidgetResult]:
+    """
+    Recompute widgets concurrently and upsert their materialized results.
+    A mirror-backed widget whose mirror watermark has not moved since it was
+    computed only gets its expiry extended. With `force`, SOQL widgets skip
+    the shared query cache.
+    """
+    existing = existing or {}
+    watermarks = await _mirror_watermarks(org_id, {w.sobject for w in widgets})
+    sf = _SalesforceSession(org_id, refresh=force)
+    semaphore = asyncio.Semaphore(settings.dashboard_eval_concurrency)
+
+    async def _evaluate(widget: Widget) -> WidgetOutcome:
+        previous = existing.get(widget.id)
+        if (
+            previous is not None
+            and previous.error is None
+            and previous.source == "mirror"
+            and previous.definition_hash == widget.definition_hash
+            and widget.sobject in watermarks
+            and previous.source_watermark == watermarks[widget.sobject]
+        ):
+            return WidgetOutcome(widget, "mirror", previous.rows, source_watermark=previous.source_watermark)
+        async with semaphore:
+            return await evaluate_widget(widget, org_id, sf, watermarks)
+
+    outcomes = await asyncio.gather(*[_evaluate(w) for w in widgets])
+
+    now = datetime.now(timezone.utc)
+    values = [
+        {
+            "dashboard_id": dashboard_id,
+            "org_id": org_id,
+            "widget_id": o.widget.id,
+            "definition_hash": o.widget.definition_hash,
+            "source": o.source,
+            "rows": o.rows,
+            "error": o.error,
+            "source_watermark": o.source_watermark,
+            "computed_at": now,
+            "expires_at": now + timedelta(
+                seconds=min(o.widget.ttl_seconds, ERROR_TTL_SECONDS) if o.error else o.widget.ttl_seconds
+            ),
+        }
+        for o in outcomes
+    ]
+    if not values:
+        return []
+
+    stmt = insert(DashboardWidgetResult).values(values)
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_dashboard_widget_results_dashboard_widget",
+        set_={
+            column: stmt.excluded[column]
+            for column in (
+                "definition_hash", "source", "rows", "error",
+                "source_watermark", "computed_at", "expires_at",
+            )
+        } | {"updated_at": func.now()},
+    ).returning(DashboardWidgetResult)
+
+    async with async_session_factory() as db:
+        result = await db.execute(stmt)
+        refreshed = list(result.scalars())
+        await db.commit()
+    return refreshed
+
+
+_background_refreshes: dict[uuid.UUID, asyncio.Task] = {}
+
+
+def _schedule_refresh(
+    org_id: uuid.UUID,
+    dashboard_id: uuid.UUID,
+    widgets: list[Widget],
+    existing: dict[str, DashboardWidgetResult],
+) -> None:
+    if dashboard_id in _background_refreshes:
+        return
+
+    async def _run():
+        try:
+            await refresh_widgets(org_id, dashboard_id, widgets, existing)
+        except Exception:
+            logger.exception("Background refresh of dashboard %s failed", dashboard_id)
+
+    task = asyncio.create_task(_run())
+    _background_refreshes[dashboard_id] = task
+    task.add_done_callback(lambda _t: _background_refreshes.pop(dashboard_id, None))
+
+
+@dataclass
+class WidgetView:
+    result: DashboardWidgetResult
+    stale: bool
+
+
+async def load_dashboard(dashboard: SavedConfig, force: bool = False) -> list[WidgetView]:
+    """
+    Return materialized results for every widget in the dashboard.
+
+    Results are read in one query. Missing widgets (or all, with force) are
+    computed before returning; expired ones are served stale while a
+    background refresh recomputes them.
+    """
+    widgets = parse_widgets(dashboard.config_data)
+
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(DashboardWidgetResult).where(DashboardWidgetResult.dashboard_id == dashboard.id)
+        )
+        existing = {row.widget_id: row for row in result.scalars()}
+
+    now = datetime.now(timezone.utc)
+    missing, expired = [], []
+    for widget in widgets:
+        row = existing.get(widget.id)
+        if force or row is None or row.definition_hash != widget.definition_hash:
+            missing.append(widget)
+        elif row.expires_at <= now:
+            expired.append(widget)
+
+    if missing:
+        for row in await refresh_widgets(dashboard.org_id, dashboard.id, missing, existing, force=force):
+            existing[row.widget_id] = row
+    if expired:
+        _schedule_refresh(dashboard.org_id, dashboard.id, expired, existing)
+
+    stale_ids = {w.id for w in expired}
+    return [
+        WidgetView(result=existing[w.id], stale=w.id in stale_ids)
+        for w in widgets
+        if w.id in existing
+    ]
@@ -1,14 +1,35 @@
+import asyncio
+import time
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, bind_pool_gauges
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
 
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
+    poolclass=InstrumentedPool,
     pool_size=5,
     max_overflow=10,
     pool_pre_ping=True,
 )
+bind_pool_gauges(engine.sync_engine.pool)
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -20,3 +41,14 @@ async_session_factory = async_sessionmaker(
 async def dispose_engine():
     """Cleanly close all connections in the pool."""
     await engine.dispose()
+
+
+async def ping_database() -> None:
+    """Round-trip a trivial query through the pool. Raises if the database is unreachable."""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_pool() -> None:
+    """Open pool_size connections up front so early requests don't pay for connection setup."""
+    await asyncio.gather(*(ping_database() for _ in range(engine.sync_engine.pool.size())))
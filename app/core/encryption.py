@@ -1,19 +1,32 @@
-from cryptography.fernet import Fernet, InvalidToken
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 
 from app.core.config import settings
+from app.core.offload import run_cpu_bound
 
-_fernet: Fernet | None = None
+# ENCRYPTION_KEY encrypts; ENCRYPTION_RETIRED_KEYS can still decrypt, so a key
+# can be rotated without downtime and stored tokens re-encrypted in the
+# background (app.core.key_rotation).
+_primary: Fernet | None = None
+_fernet: MultiFernet | None = None
 
 
-def _get_fernet() -> Fernet:
-    global _fernet
-    if _fernet is None:
+def _get_primary() -> Fernet:
+    global _primary
+    if _primary is None:
         if not settings.encryption_key:
             raise RuntimeError(
                 "ENCRYPTION_KEY is not set. "
                 "Generate one with: python -c \"from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())\""
             )
-        _fernet = Fernet(settings.encryption_key.encode())
+        _primary = Fernet(settings.encryption_key.encode())
+    return _primary
+
+
+def _get_fernet() -> MultiFernet:
+    global _fernet
+    if _fernet is None:
+        retired = [Fernet(key.encode()) for key in settings.encryption_retired_keys]
+        _fernet = MultiFernet([_get_primary(), *retired])
     return _fernet
 
 
@@ -28,3 +41,38 @@ def decrypt_token(ciphertext: str) -> str:
         return _get_fernet().decrypt(ciphertext.encode()).decode()
     except InvalidToken:
         raise ValueError("Failed to decrypt token — key mismatch or corrupted data")
+
+
+def _encrypt_many(plaintexts: list[str]) -> list[str]:
+    return [encrypt_token(p) for p in plaintexts]
+
+
+def _decrypt_many(ciphertexts: list[str]) -> list[str]:
+    return [decrypt_token(c) for c in ciphertexts]
+
+
+async def encrypt_tokens(plaintexts: list[str]) -> list[str]:
+    """Encrypt a batch of tokens, off the event loop when CPU offload is enabled and the batch is large."""
+    return await run_cpu_bound(_encrypt_many, plaintexts, inline=len(plaintexts) < settings.cpu_offload_min_batch)
+
+
+async def decrypt_tokens(ciphertexts: list[str]) -> list[str]:
+    """Decrypt a batch of tokens (see encrypt_tokens). Raises ValueError if any fails."""
+    return await run_cpu_bound(_decrypt_many, ciphertexts, inline=len(ciphertexts) < settings.cpu_offload_min_batch)
+
+
+def rotate_token(ciphertext: str) -> str | None:
+    """
+    Re-encrypt a token under the primary key, keeping its original timestamp.
+    Returns None if it is already encrypted with the primary key.
+    Raises ValueError if no configured key can decrypt it.
+    """
+    try:
+        _get_primary().decrypt(ciphertext.encode())
+        return None
+    except InvalidToken:
+        pass
+    try:
+        return _get_fernet().rotate(ciphertext.encode()).decode()
+    except InvalidToken:
+        raise ValueError("Failed to decrypt token — key mismatch or corrupted data")
@@ -0,0 +1,181 @@
+"""
+Fleet-wide Salesforce connection health check.
+
+Streams every `salesforce_connections` row through a server-side cursor and
+runs the same check as GET /salesforce/test for each one, at most
+`concurrency` at a time, over the shared Salesforce HTTP client. Tokens answered with 401 are
+refreshed (and persisted) along the way. Results are yielded as they complete, and written back to the
+`last_check_*` columns in batches.
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from httpx import HTTPStatusError
+from sqlalchemy import Float, String, Text, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import DateTime
+
+from app.core.connections import (
+    DecryptedSalesforceConnection,
+    SalesforceTokenRefreshError,
+    refresh_salesforce_connection,
+)
+from app.core.database import async_session_factory
+from app.core.encryption import decrypt_tokens
+from app.core.metrics import SF_RETRIES
+from app.core.salesforce import test_salesforce_connection
+from app.models.salesforce_connection import SalesforceConnection
+from app.schemas.salesforce import ConnectionHealthResult
+
+RECORD_BATCH_SIZE = 100
+
+
+class _UndecryptableTokens(Exception):
+    pass
+
+
+async def _refresh(sf_conn: DecryptedSalesforceConnection) -> DecryptedSalesforceConnection:
+    async with async_session_factory() as db:
+        sf_conn = await refresh_salesforce_connection(db, sf_conn)
+        await db.commit()
+    return sf_conn
+
+
+async def check_connection(row) -> ConnectionHealthResult:
+    """Check one connection row. Never raises; failures are reported in the result."""
+    start = time.perf_counter()
+    refreshed = False
+    api_version = error = None
+    try:
+        try:
+            access_token, refresh_token = await decrypt_tokens([row.access_token, row.refresh_token])
+        except ValueError as e:
+            raise _UndecryptableTokens(str(e)) from e
+        sf_conn = DecryptedSalesforceConnection(
+            id=row.id,
+            org_id=row.org_id,
+            access_token=access_token,
+            refresh_token=refresh_token,
+            instance_url=row.instance_url,
+            salesforce_org_id=row.salesforce_org_id,
+        )
+        try:
+            info = await test_salesforce_connection(sf_conn.instance_url, sf_conn.access_token)
+        except HTTPStatusError as e:
+            if e.response.status_code != 401:
+                raise
+            SF_RETRIES.labels("versions", "token_expired").inc()
+            sf_conn = await _refresh(sf_conn)
+            refreshed = True
+            info = await test_salesforce_connection(sf_conn.instance_url, sf_conn.access_token)
+        api_version = info["api_version"]
+        status = "ok"
+    except _UndecryptableTokens as e:
+        status, error = "undecryptable", str(e)
+    except SalesforceTokenRefreshError as e:
+        status, error = "auth_failed", str(e)
+    except HTTPStatusError as e:
+        status = "auth_failed" if e.response.status_code in (401, 403) else "error"
+        error = f"Salesforce API error: {e.response.status_code} {e.response.text[:500]}"
+    except Exception as e:
+        status, error = "error", f"Failed to connect to Salesforce: {e!r}"
+
+    return ConnectionHealthResult(
+        connection_id=row.id,
+        org_id=row.org_id,
+        instance_url=row.instance_url,
+        status=status,
+        latency_ms=round((time.perf_counter() - start) * 1000, 1),
+        token_refreshed=refreshed,
+        api_version=api_version,
+        error=error,
+        checked_at=datetime.now(timezone.utc),
+    )
+
+
+async def record_results(results: list[ConnectionHealthResult]) -> None:
+    """Write a batch of results to the `last_check_*` columns in one statement."""
+    batch = values(
+        column("id", UUID(as_uuid=True)),
+        column("checked_at", DateTime(timezone=True)),
+        column("status", String),
+        column("latency_ms", Float),
+        column("error", Text),
+        name="batch",
+    ).data([(r.connection_id, r.checked_at, r.status, r.latency_ms, r.error) for r in results])
+    stmt = (
+        update(SalesforceConnection)
+        .where(SalesforceConnection.id == batch.c.id)
+        .values(
+            last_checked_at=batch.c.checked_at,
+            last_check_status=batch.c.status,
+            last_check_latency_ms=batch.c.latency_ms,
+            last_check_error=batch.c.error,
+            # A health check is not a change to the connection
+            updated_at=SalesforceConnection.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    async with async_session_factory() as db:
+        await db.execute(stmt)
+        await db.commit()
+
+
+async def check_all_connections(
+    concurrency: int,
+    org_ids: list[uuid.UUID] | None = None,
+) -> AsyncIterator[ConnectionHealthResult]:
+    """Check every connection (or those of `org_ids`), yielding results in completion order."""
+    stmt = (
+        select(
+            SalesforceConnection.id,
+            SalesforceConnection.org_id,
+            SalesforceConnection.access_token,
+            SalesforceConnection.refresh_token,
+            SalesforceConnection.instance_url,
+            SalesforceConnection.salesforce_org_id,
+        )
+        .order_by(SalesforceConnection.id)
+        .execution_options(yield_per=max(concurrency * 2, 100))
+    )
+    if org_ids:
+        stmt = stmt.where(SalesforceConnection.org_id.in_(org_ids))
+
+    pending: set[asyncio.Task] = set()
+    unrecorded: list[ConnectionHealthResult] = []
+
+    async def next_completed() -> list[ConnectionHealthResult]:
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        results = [task.result() for task in done]
+        unrecorded.extend(results)
+        if len(unrecorded) >= RECORD_BATCH_SIZE:
+            await record_results(unrecorded)
+            unrecorded.clear()
+        return results
+
+    try:
+        async with async_session_factory() as db:
+            rows = await db.stream(stmt)
+            async for row in rows:
+                if len(pending) >= concurrency:
+                    for result in await next_completed():
+                        yield result
+                pending.add(asyncio.create_task(check_connection(row)))
+        while pending:
+            for result in await next_completed():
+                yield result
+    finally:
+        # Client went away mid-stream: stop outstanding checks, and keep the
+        # results that completed
+        for task in pending:
+            task.cancel()
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, ConnectionHealthResult):
+                unrecorded.append(result)
+        if unrecorded:
+            await record_results(unrecorded)
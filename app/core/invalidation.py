@@ -0,0 +1,72 @@
+"""
+Cross-process cache invalidation over Postgres LISTEN/NOTIFY.
+
+In-process caches register under a name; writers call
+`invalidation_bus.publish(db, name, namespace)` inside the transaction that
+changes the underlying rows. The NOTIFY is delivered on commit to every
+process listening on the channel (including the sender, which covers reads
+that raced the commit), and each drops that namespace from its own cache.
+The local cache is also invalidated immediately at publish time.
+
+Notifications sent while a listener is disconnected are lost, so every
+registered cache is cleared when the listener reconnects; TTLs bound
+staleness for anything in between.
+"""
+
+import json
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.notify import notify, pg_listener
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+
+
+class InvalidationBus:
+    def __init__(self):
+        self._caches: dict[str, TTLCache] = {}
+        self._started = False
+
+    def register(self, name: str, cache: TTLCache) -> TTLCache:
+        self._caches[name] = cache
+        return cache
+
+    async def start(self) -> None:
+        if not self._started:
+            self._started = True
+            await pg_listener.subscribe(CACHE_INVALIDATION_CHANNEL, self._on_notify)
+            pg_listener.on_reconnect(self._on_reconnect)
+
+    async def stop(self) -> None:
+        if self._started:
+            self._started = False
+            await pg_listener.unsubscribe(CACHE_INVALIDATION_CHANNEL, self._on_notify)
+
+    async def publish(self, db: AsyncSession, cache: str, namespace: str) -> None:
+        """Invalidate `namespace` of `cache` here now, and in every process on commit."""
+        self.invalidate_local(cache, namespace)
+        await notify(db, CACHE_INVALIDATION_CHANNEL, json.dumps({"cache": cache, "namespace": namespace}))
+
+    def invalidate_local(self, cache: str, namespace: str) -> None:
+        target = self._caches.get(cache)
+        if target is not None:
+            target.invalidate(namespace)
+
+    def _on_notify(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            self.invalidate_local(message["cache"], message["namespace"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed cache invalidation payload: %r", payload[:200])
+
+    def _on_reconnect(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+
+# Process-wide bus
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,222 @@
+"""
+Postgres-backed job queue.
+
+Jobs are claimed with `FOR UPDATE SKIP LOCKED` so any number of workers can
+poll the same table without contention. A claimed job holds a visibility
+timeout (`locked_until`) that the worker extends while it runs; if the worker
+dies, the lock lapses and another worker picks the job up. Failures are
+retried with exponential backoff until `max_attempts`, then marked dead.
+Enqueueing sends NOTIFY on JOBS_CHANNEL so idle workers wake immediately.
+"""
+
+import copy
+import json
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.notify import notify
+from app.models.job import Job
+
+JOBS_CHANNEL = "jobs"
+JOB_PROGRESS_CHANNEL = "job_progress"
+
+TERMINAL_STATUSES = {"succeeded", "dead"}
+
+
+@dataclass
+class JobContext:
+    """What a handler sees of its job."""
+
+    job_id: uuid.UUID
+    org_id: uuid.UUID | None
+    kind: str
+    payload: dict
+    attempt: int
+    # Last reported progress, so retried handlers can resume where they stopped
+    progress: dict | None = None
+
+    async def report_progress(self, **progress) -> None:
+        await update_progress(self.job_id, progress)
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict | None]]
+
+JOB_HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register a coroutine as the handler for a job kind."""
+
+    def decorator(fn: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = fn
+        return fn
+
+    return decorator
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    kind: str,
+    payload: dict | None = None,
+    org_id: uuid.UUID | None = None,
+    run_after: datetime | None = None,
+    max_attempts: int | None = None,
+) -> Job:
+    """Add a job in the caller's transaction; workers are notified on commit."""
+    job = Job(
+        org_id=org_id,
+        kind=kind,
+        payload=payload or {},
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts or settings.job_max_attempts,
+    )
+    if run_after is not None:
+        job.run_after = run_after
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    await notify(db, JOBS_CHANNEL, kind)
+    return job
+
+
+async def publish_job_event(
+    db: AsyncSession,
+    job_id: uuid.UUID,
+    status: str,
+    progress: dict | None = None,
+) -> None:
+    """NOTIFY progress subscribers (delivered when the transaction commits)."""
+    payload = {"job_id": str(job_id), "status": status, "progress": progress}
+    await notify(db, JOB_PROGRESS_CHANNEL, json.dumps(payload, default=str))
+
+
+async def claim_jobs(worker_id: str, limit: int) -> list[Job]:
+    """Claim up to `limit` due jobs for this worker and commit the claim."""
+    now = func.now()
+    claimable = (
+        select(Job.id)
+        .where(
+            or_(
+                and_(Job.status.in_(("queued", "failed")), Job.run_after <= now),
+                and_(Job.status == "running", Job.locked_until < now),
+            )
+        )
+        .order_by(Job.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Job)
+        .where(Job.id.in_(claimable.scalar_subquery()))
+        .values(
+            status="running",
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=settings.job_visibility_timeout_seconds),
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    async with async_session_factory() as db:
+        result = await db.execute(stmt)
+        jobs = list(result.scalars())
+        for job in jobs:
+            await publish_job_event(db, job.id, job.status, job.progress)
+        await db.commit()
+    return jobs
+
+
+async def extend_lock(job_id: uuid.UUID, worker_id: str) -> bool:
+    """Push out the visibility timeout. Returns False if the job was taken over."""
+    async with async_session_factory() as db:
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == "running")
+            .values(locked_until=func.now() + timedelta(seconds=settings.job_visibility_timeout_seconds))
+            .returning(Job.id)
+        )
+        extended = result.scalar_one_or_none() is not None
+        await db.commit()
+    return extended
+
+
+async def update_progress(job_id: uuid.UUID, progress: dict) -> None:
+    async with async_session_factory() as db:
+        await db.execute(update(Job).where(Job.id == job_id).values(progress=progress))
+        await publish_job_event(db, job_id, "running", progress)
+        await db.commit()
+
+
+async def complete_job(job_id: uuid.UUID, worker_id: str, result: dict | None) -> bool:
+    """Mark the job succeeded. Returns False if another worker has taken it over."""
+    async with async_session_factory() as db:
+        updated = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id)
+            .values(
+                status="succeeded",
+                result=result,
+                last_error=None,
+                locked_until=None,
+                finished_at=func.now(),
+            )
+            .returning(Job.id)
+        )
+        if updated.scalar_one_or_none() is None:
+            return False
+        await publish_job_event(db, job_id, "succeeded")
+        await db.commit()
+    return True
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff: base * 2^(attempts-1), capped."""
+    seconds = settings.job_retry_backoff_seconds * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.job_retry_backoff_max_seconds))
+
+
+async def fail_job(job: Job, worker_id: str, error: str) -> str | None:
+    """
+    Schedule a retry, or mark the job dead once attempts are exhausted.
+    Returns the new status, or None if another worker has taken the job over.
+    """
+    dead = job.attempts >= job.max_attempts
+    values = {"last_error": error, "locked_until": None}
+    if dead:
+        values |= {"status": "dead", "finished_at": func.now()}
+    else:
+        values |= {
+            "status": "failed",
+            "run_after": datetime.now(timezone.utc) + retry_delay(job.attempts),
+        }
+    async with async_session_factory() as db:
+        updated = await db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == worker_id)
+            .values(**values)
+            .returning(Job.id)
+        )
+        if updated.scalar_one_or_none() is None:
+            return None
+        await publish_job_event(db, job.id, values["status"])
+        await db.commit()
+    return values["status"]
+
+
+def job_context(job: Job) -> JobContext:
+    return JobContext(
+        job_id=job.id,
+        org_id=job.org_id,
+        kind=job.kind,
+        payload=copy.deepcopy(job.payload),
+        attempt=job.attempts,
+        progress=copy.deepcopy(job.progress),
+    )
@@ -0,0 +1,130 @@
+"""
+Background re-encryption of stored Salesforce tokens after a key rotation.
+
+Rotating ENCRYPTION_KEY means moving the old key into ENCRYPTION_RETIRED_KEYS
+(so existing tokens still decrypt) and enqueueing a `reencrypt_tokens` job,
+e.g. via POST /admin/encryption/rotate. The job:
+
+- streams `salesforce_connections` in id order through a server-side cursor,
+  REENCRYPT_BATCH_SIZE rows at a time;
+- re-encrypts each batch in the CPU offload pool, skipping tokens already
+  under the primary key;
+- writes a batch back with one `UPDATE ... FROM (VALUES ...)` that only
+  matches rows whose ciphertext is unchanged, so a token refreshed in the
+  meantime (already written under the primary key) is never overwritten;
+- records the last id in job progress after each batch, so a retried job
+  resumes where the previous attempt stopped;
+- sleeps between batches to stay under REENCRYPT_MAX_ROWS_PER_SECOND.
+
+Once the job has succeeded with `undecryptable == 0`, the retired key can be
+removed.
+"""
+
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import Text, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.encryption import rotate_token
+from app.core.jobs import JobContext, job_handler
+from app.core.offload import offload
+from app.models.salesforce_connection import SalesforceConnection
+
+REENCRYPT_JOB_KIND = "reencrypt_tokens"
+
+_COUNTERS = ("scanned", "rotated", "already_current", "changed_concurrently", "undecryptable")
+
+
+def _rotate_batch(rows: list[tuple[uuid.UUID, str, str]]) -> tuple[list[tuple], int]:
+    """Re-encrypt a batch. Returns (update rows, number of rows no key could decrypt)."""
+    updates, undecryptable = [], 0
+    for conn_id, access_token, refresh_token in rows:
+        try:
+            new_access = rotate_token(access_token)
+            new_refresh = rotate_token(refresh_token)
+        except ValueError:
+            undecryptable += 1
+            continue
+        if new_access is None and new_refresh is None:
+            continue
+        updates.append((
+            conn_id,
+            access_token,
+            new_access or access_token,
+            refresh_token,
+            new_refresh or refresh_token,
+        ))
+    return updates, undecryptable
+
+
+async def _write_batch(updates: list[tuple]) -> int:
+    """Apply re-encrypted tokens in one statement. Returns the number of rows updated."""
+    batch = values(
+        column("id", UUID(as_uuid=True)),
+        column("old_access", Text),
+        column("new_access", Text),
+        column("old_refresh", Text),
+        column("new_refresh", Text),
+        name="batch",
+    ).data(updates)
+    stmt = (
+        update(SalesforceConnection)
+        .where(
+            SalesforceConnection.id == batch.c.id,
+            # Compare-and-swap: skip rows rewritten since we read them
+            SalesforceConnection.access_token == batch.c.old_access,
+            SalesforceConnection.refresh_token == batch.c.old_refresh,
+        )
+        .values(access_token=batch.c.new_access, refresh_token=batch.c.new_refresh)
+        .execution_options(synchronize_session=False)
+    )
+    async with async_session_factory() as db:
+        result = await db.execute(stmt)
+        await db.commit()
+    return result.rowcount
+
+
+@job_handler(REENCRYPT_JOB_KIND)
+async def reencrypt_tokens(ctx: JobContext) -> dict:
+    """Re-encrypt every stored token under the primary key (resumable, rate-limited)."""
+    progress = ctx.progress or {}
+    counts = {name: progress.get(name, 0) for name in _COUNTERS}
+    last_id = uuid.UUID(progress["last_id"]) if progress.get("last_id") else None
+    batch_size = ctx.payload.get("batch_size") or settings.reencrypt_batch_size
+    max_rate = ctx.payload.get("max_rows_per_second") or settings.reencrypt_max_rows_per_second
+
+    stmt = (
+        select(SalesforceConnection.id, SalesforceConnection.access_token, SalesforceConnection.refresh_token)
+        .order_by(SalesforceConnection.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if last_id is not None:
+        stmt = stmt.where(SalesforceConnection.id > last_id)
+
+    async with async_session_factory() as read_db:
+        result = await read_db.stream(stmt)
+        async for partition in result.partitions(batch_size):
+            started = time.monotonic()
+            rows = [tuple(row) for row in partition]
+
+            updates, undecryptable = await offload(_rotate_batch, rows)
+            written = await _write_batch(updates) if updates else 0
+
+            counts["scanned"] += len(rows)
+            counts["rotated"] += written
+            counts["changed_concurrently"] += len(updates) - written
+            counts["undecryptable"] += undecryptable
+            counts["already_current"] += len(rows) - len(updates) - undecryptable
+            last_id = rows[-1][0]
+            await ctx.report_progress(last_id=str(last_id), **counts)
+
+            # Rate limit: spread batches so rows/second stays under max_rate
+            remaining = len(rows) / max_rate - (time.monotonic() - started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+    return counts
@@ -0,0 +1,107 @@
+"""
+Event loop lag monitoring.
+
+A coroutine wakes every `LOOP_LAG_INTERVAL_MS` and records how late it was
+scheduled in the `event_loop_lag_seconds` histogram. Late wakeups only say
+*that* the loop was blocked, not by whom, so a watchdog thread also checks
+the coroutine's heartbeat: once it is overdue by `LOOP_STALL_THRESHOLD_MS`,
+the watchdog captures the loop thread's stack while the blocking code is
+still running, logs it, and keeps it in a small buffer (GET /admin/loop-stalls).
+"""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoopStall:
+    detected_at: datetime
+    task: str | None
+    stack: list[str]
+    # Filled in once the loop runs again
+    duration_ms: float | None = None
+
+
+class LoopMonitor:
+    def __init__(self, interval_ms: float | None = None, threshold_ms: float | None = None):
+        self.interval = (interval_ms or settings.loop_lag_interval_ms) / 1000
+        self.threshold = (threshold_ms or settings.loop_stall_threshold_ms) / 1000
+        self.stalls: deque[LoopStall] = deque(maxlen=20)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._current_stall: LoopStall | None = None
+        self._task: asyncio.Task | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+
+    async def _tick(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - start - self.interval, 0.0)
+            EVENT_LOOP_LAG.observe(lag)
+            stall = self._current_stall
+            if stall is not None:
+                stall.duration_ms = round(lag * 1000, 1)
+                self._current_stall = None
+                logger.warning("Event loop resumed after blocking for %.0fms", stall.duration_ms)
+            self._last_beat = now
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            overdue = time.monotonic() - self._last_beat - self.interval
+            if overdue < self.threshold or self._current_stall is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+            stall = LoopStall(
+                detected_at=datetime.now(timezone.utc),
+                task=task.get_name() if task is not None else None,
+                stack=traceback.format_stack(frame),
+            )
+            del frame
+            self._current_stall = stall
+            self.stalls.append(stall)
+            EVENT_LOOP_STALLS.inc()
+            logger.warning(
+                "Event loop blocked for over %.0fms (task %s):\n%s",
+                overdue * 1000, stall.task, "".join(stall.stack),
+            )
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,244 @@
+"""
+Prometheus metrics.
+
+Under gunicorn with PROMETHEUS_MULTIPROC_DIR set, counters and histograms are
+aggregated across workers, and gauges are summed over live workers.
+
+Label values are always bounded: routes are labelled by their template
+(`/records/{sobject}`, never the raw path), Salesforce calls by endpoint
+class, and no org ids are used as labels. Pool occupancy gauges are set from
+the pool's checkout and checkin events.
+"""
+
+import logging
+import os
+import time
+
+import httpx
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Set by `python -m app.start` before it execs the server; otherwise the time
+# this module was first imported
+BOOT_STARTED_AT = float(os.environ.get("APP_BOOT_STARTED_AT") or time.time())
+
+# --- Startup ---
+
+APP_TIME_TO_READY = Gauge(
+    "app_time_to_ready_seconds",
+    "Seconds from boot (schema check included) until the DB pool and HTTP client were warm.",
+    multiprocess_mode="max",
+)
+APP_TIME_TO_FIRST_REQUEST = Gauge(
+    "app_time_to_first_request_seconds",
+    "Seconds from boot until the first HTTP request was served.",
+    multiprocess_mode="max",
+)
+
+# --- HTTP server ---
+
+# Anything else (e.g. arbitrary client-supplied verbs) is labelled "OTHER"
+_HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# --- Database pool ---
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a connection from the SQLAlchemy pool (includes pre-ping).",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured persistent pool size.", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open beyond pool_size.",
+    multiprocess_mode="livesum",
+)
+
+# --- Event loop ---
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the loop monitor's periodic wakeup ran (time the loop was busy elsewhere).",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Times the loop was blocked past the stall threshold (a stack was captured).",
+)
+
+# --- Shared cache ---
+
+SHARED_CACHE_LOOKUPS = Counter(
+    "shared_cache_lookups_total",
+    "Shared cache lookups, by cache and outcome (memory_hit, shared_hit, miss, refresh).",
+    ["cache", "outcome"],
+)
+SHARED_CACHE_LOCK_WAITS = Counter(
+    "shared_cache_lock_waits_total",
+    "Lookups that waited for another process computing the same entry, by cache.",
+    ["cache"],
+)
+SHARED_CACHE_EVICTIONS = Counter(
+    "shared_cache_evictions_total",
+    "Entries removed from the shared cache table by the sweeper, by reason (expired, size).",
+    ["reason"],
+)
+
+# --- Salesforce ---
+
+SF_REQUEST_DURATION = Histogram(
+    "salesforce_request_duration_seconds",
+    "Salesforce HTTP call latency (to response headers), by endpoint class.",
+    ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0),
+)
+SF_REQUESTS = Counter(
+    "salesforce_requests_total",
+    "Salesforce HTTP calls, by endpoint class and status code ('error' for transport failures).",
+    ["endpoint", "status"],
+)
+SF_RETRIES = Counter(
+    "salesforce_retries_total",
+    "Salesforce calls retried, by endpoint class and reason.",
+    ["endpoint", "reason"],
+)
+SF_TOKEN_REFRESHES = Counter(
+    "salesforce_token_refreshes_total",
+    "Salesforce access token refresh attempts, by outcome.",
+    ["outcome"],
+)
+
+
+def sf_endpoint_class(path: str) -> str:
+    """Map a Salesforce URL path onto a small fixed set of endpoint classes."""
+    if path.startswith("/services/oauth2/"):
+        action = path.rsplit("/", 1)[-1]
+        return f"oauth_{action}" if action in ("token", "revoke") else "oauth_other"
+    if path.startswith("/cometd/"):
+        return "streaming"
+    if path.rstrip("/") == "/services/data":
+        return "versions"
+    if "/query" in path:
+        return "query"
+    if "/sobjects" in path:
+        return "sobjects"
+    return "other"
+
+
+def bind_pool_gauges(pool) -> None:
+    """
+    Publish pool occupancy from the pool's checkout/checkin events
+    (`set_function` gauges are never written to the multiprocess files, so
+    they would export zeros under gunicorn).
+    """
+
+    def on_checkout(*_):
+        # Set here rather than at import so the gunicorn master (which
+        # imports the app but never checks out) doesn't add to the sum
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    def on_checkin(*_):
+        # Fires before the connection goes back: if the pool's queue is full
+        # (overflow == checkedout), it will be closed and overflow drops by one
+        checked_out, overflow = pool.checkedout(), pool.overflow()
+        if overflow > 0 and overflow == checked_out:
+            overflow -= 1
+        DB_POOL_CHECKED_OUT.set(checked_out - 1)
+        DB_POOL_OVERFLOW.set(max(overflow, 0))
+
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """Wraps an httpx transport to time Salesforce calls by endpoint class."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = sf_endpoint_class(request.url.path)
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            SF_REQUESTS.labels(endpoint, "error").inc()
+            raise
+        finally:
+            SF_REQUEST_DURATION.labels(endpoint).observe(time.perf_counter() - start)
+        SF_REQUESTS.labels(endpoint, str(response.status_code)).inc()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency, status and in-flight
+    requests. The route label is read from the matched route after the app
+    has run, so unmatched paths collapse into a single "unmatched" label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._served_first = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in _HTTP_METHODS else "OTHER"
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            route = scope.get("route")
+            route_label = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, route_label).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route_label, str(status_code)).inc()
+            if not self._served_first:
+                self._served_first = True
+                since_boot = time.time() - BOOT_STARTED_AT
+                APP_TIME_TO_FIRST_REQUEST.set(since_boot)
+                logger.info("First request served %.0fms after boot", since_boot * 1000)
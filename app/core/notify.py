@@ -0,0 +1,136 @@
+"""
+Postgres LISTEN/NOTIFY plumbing.
+
+Each process holds at most one dedicated asyncpg connection for LISTEN,
+shared by every subscriber; callbacks are dispatched in-process. NOTIFY is
+sent through the normal session so it is delivered only on commit.
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NotifyCallback = Callable[[str], None]
+
+
+def asyncpg_dsn() -> str:
+    """Plain asyncpg DSN from the SQLAlchemy DATABASE_URL."""
+    return settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def notify(db: AsyncSession, channel: str, payload: str = "") -> None:
+    """Queue a NOTIFY on the session's transaction (sent on commit)."""
+    await db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+class PgListener:
+    """
+    One LISTEN connection per process, fanned out to in-process callbacks.
+    Reconnects with backoff; `on_reconnect` callbacks run after every
+    successful connect (the first one included) and let subscribers resync
+    anything they may have missed while disconnected.
+    """
+
+    def __init__(self):
+        self._callbacks: dict[str, set[NotifyCallback]] = {}
+        self._reconnect_callbacks: set[Callable[[], None]] = set()
+        self._conn: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._connected = asyncio.Event()
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._conn is not None:
+            with contextlib.suppress(Exception):
+                await self._conn.close()
+            self._conn = None
+
+    async def subscribe(self, channel: str, callback: NotifyCallback) -> None:
+        """Register a callback for a channel, starting the listener if needed."""
+        first = channel not in self._callbacks
+        self._callbacks.setdefault(channel, set()).add(callback)
+        await self.start()
+        if first and self.connected:
+            await self._conn.add_listener(channel, self._dispatch)
+
+    async def unsubscribe(self, channel: str, callback: NotifyCallback) -> None:
+        callbacks = self._callbacks.get(channel)
+        if callbacks is None:
+            return
+        callbacks.discard(callback)
+        if not callbacks:
+            del self._callbacks[channel]
+            if self.connected:
+                with contextlib.suppress(Exception):
+                    await self._conn.remove_listener(channel, self._dispatch)
+
+    def on_reconnect(self, callback: Callable[[], None]) -> None:
+        self._reconnect_callbacks.add(callback)
+
+    async def wait_connected(self, timeout: float | None = None) -> None:
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    def _dispatch(self, _conn, _pid, channel: str, payload: str) -> None:
+        for callback in list(self._callbacks.get(channel, ())):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("NOTIFY callback for %s failed", channel)
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            closed = asyncio.Event()
+            try:
+                self._conn = await asyncpg.connect(asyncpg_dsn())
+                self._conn.add_termination_listener(lambda _c: closed.set())
+                for channel in list(self._callbacks):
+                    await self._conn.add_listener(channel, self._dispatch)
+                self._connected.set()
+                backoff = 1.0
+
+                # Also on the first connect: subscribers may have read state
+                # while nothing was listening yet
+                for callback in list(self._reconnect_callbacks):
+                    callback()
+
+                await closed.wait()
+                logger.warning("LISTEN connection lost; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("LISTEN connection failed; retrying in %.0fs", backoff, exc_info=True)
+            finally:
+                self._connected.clear()
+                if self._conn is not None and not self._conn.is_closed():
+                    with contextlib.suppress(Exception):
+                        await self._conn.close()
+                self._conn = None
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+# Process-wide listener
+pg_listener = PgListener()
@@ -0,0 +1,54 @@
+"""
+Optional thread-pool offload for CPU-bound helpers.
+
+With `CPU_OFFLOAD_ENABLED=true`, bulk token encryption/decryption and parsing
+of large JSON bodies run in a dedicated thread pool instead of on the event
+loop. The GIL still serializes pure-Python work, but the interpreter switches
+threads every few milliseconds, so one tenant's 5 MB Salesforce page no
+longer stalls every other request for its whole parse time. Small inputs stay
+inline, where a thread hop would cost more than it saves.
+"""
+
+import asyncio
+import functools
+import json
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.cpu_offload_workers, thread_name_prefix="cpu-offload")
+    return _executor
+
+
+async def offload(fn: Callable[..., T], *args) -> T:
+    """Always run `fn(*args)` in the offload pool (for background jobs that are CPU-bound by design)."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), functools.partial(fn, *args))
+
+
+async def run_cpu_bound(fn: Callable[..., T], *args, inline: bool = False) -> T:
+    """Run `fn(*args)` in the offload pool, or inline if offloading is off or `inline` is set."""
+    if inline or not settings.cpu_offload_enabled:
+        return fn(*args)
+    return await offload(fn, *args)
+
+
+async def parse_json(body: bytes):
+    """json.loads, offloaded for bodies of at least CPU_OFFLOAD_JSON_MIN_BYTES."""
+    return await run_cpu_bound(json.loads, body, inline=len(body) < settings.cpu_offload_json_min_bytes)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
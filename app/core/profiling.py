@@ -0,0 +1,231 @@
+"""
+Opt-in per-request sampling profiler.
+
+A request is profiled when it carries `X-Profile: <ADMIN_TOKEN>` or is picked
+by `PROFILE_SAMPLE_RATE`. While any profiled request is in flight, a daemon
+thread samples the event loop thread every `PROFILE_INTERVAL_MS`:
+
+- if the request's coroutine is on the running stack, the live stack is
+  recorded (on-CPU time);
+- otherwise the request is suspended, and its await chain is recorded with a
+  trailing `[await]` frame (time spent waiting on the DB, Salesforce, or
+  other requests hogging the loop).
+
+Samples are aggregated into collapsed stacks (`frame;frame;frame count`, the
+input format of flamegraph.pl and speedscope) and kept in a bounded ring
+buffer served by /admin/profiles. Nothing runs for unprofiled requests beyond
+a header check and one random() call; the sampler thread exists only while a
+profile is being taken.
+"""
+
+import asyncio
+import hmac
+import itertools
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.core.config import settings
+
+AWAIT_FRAME = "[await]"
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_qualname}:{frame.f_lineno}".replace(";", ",")
+
+
+def _await_chain(awaitable):
+    """Frames of a suspended coroutine and everything it is awaiting, outermost first."""
+    while awaitable is not None:
+        frame = (
+            getattr(awaitable, "cr_frame", None)
+            or getattr(awaitable, "gi_frame", None)
+            or getattr(awaitable, "ag_frame", None)
+        )
+        if frame is None:
+            return
+        yield frame
+        awaitable = (
+            getattr(awaitable, "cr_await", None)
+            or getattr(awaitable, "gi_yieldfrom", None)
+            or getattr(awaitable, "ag_await", None)
+        )
+
+
+class ProfileSession:
+    """Samples collected for one in-flight request."""
+
+    def __init__(self, root_frame, task: asyncio.Task, thread_id: int):
+        self.root_frame = root_frame
+        self.task = task
+        self.thread_id = thread_id
+        self.stacks: Counter[str] = Counter()
+
+    def sample(self, current) -> None:
+        stack = self._running_stack(current)
+        if stack is None:
+            stack = self._suspended_stack()
+        if stack:
+            self.stacks[";".join(stack)] += 1
+
+    def _running_stack(self, current) -> list[str] | None:
+        frames = []
+        frame = current
+        while frame is not None:
+            frames.append(frame)
+            if frame is self.root_frame:
+                return [_frame_name(f) for f in reversed(frames)]
+            frame = frame.f_back
+        return None
+
+    def _suspended_stack(self) -> list[str]:
+        frames = list(_await_chain(self.task.get_coro()))
+        for i, frame in enumerate(frames):
+            if frame is self.root_frame:
+                return [*map(_frame_name, frames[i:]), AWAIT_FRAME]
+        return []
+
+
+class _Sampler:
+    """Shared sampling thread; runs only while sessions are registered."""
+
+    def __init__(self):
+        self._sessions: set[ProfileSession] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def add(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def remove(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+    def _run(self) -> None:
+        interval = settings.profile_interval_ms / 1000
+        while True:
+            with self._lock:
+                if not self._sessions:
+                    self._thread = None
+                    return
+                sessions = list(self._sessions)
+            current = sys._current_frames()
+            for session in sessions:
+                try:
+                    session.sample(current.get(session.thread_id))
+                except Exception:
+                    # The loop mutates frames underneath us; drop the sample
+                    pass
+            del current
+            time.sleep(interval)
+
+
+_sampler = _Sampler()
+
+
+@dataclass
+class Profile:
+    id: int
+    method: str
+    path: str
+    route: str | None
+    status: int
+    started_at: datetime
+    duration_ms: float
+    interval_ms: float
+    stacks: Counter = field(repr=False)
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Ring buffer of the most recent profiles."""
+
+    def __init__(self, maxlen: int):
+        self._profiles: deque[Profile] = deque(maxlen=maxlen)
+        self._ids = itertools.count(1)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile: Profile) -> None:
+        self._profiles.append(profile)
+
+    def get(self, profile_id: int) -> Profile | None:
+        return next((p for p in self._profiles if p.id == profile_id), None)
+
+    def list(self) -> list[Profile]:
+        return list(reversed(self._profiles))
+
+
+profile_store = ProfileStore(settings.profile_buffer_size)
+
+
+def _triggered(scope) -> bool:
+    if settings.admin_token:
+        for name, value in scope["headers"]:
+            if name == b"x-profile" and hmac.compare_digest(value, settings.admin_token.encode()):
+                return True
+    return random.random() < settings.profile_sample_rate
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware. Profiled responses carry `X-Profile-Id`; fetch the
+    result from GET /admin/profiles/{id}. Only installed when ADMIN_TOKEN or
+    PROFILE_SAMPLE_RATE is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _triggered(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profile_store.next_id()
+        session = ProfileSession(sys._getframe(), asyncio.current_task(), threading.get_ident())
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", str(profile_id).encode())]
+            await send(message)
+
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        _sampler.add(session)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _sampler.remove(session)
+            route = scope.get("route")
+            profile_store.add(Profile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                route=route.path if route is not None else None,
+                status=status_code,
+                started_at=started_at,
+                duration_ms=round((time.perf_counter() - start) * 1000, 2),
+                interval_ms=settings.profile_interval_ms,
+                stacks=session.stacks,
+            ))
@@ -0,0 +1,335 @@
+"""
+Query compiler for the local Salesforce record mirror.
+
+Filters and sorts arrive as a small string DSL and are compiled into SQL over
+`salesforce_records`. Field names are validated and JSONB keys are inlined as
+literals so that the expressions match the on-demand expression indexes
+built from each org's index config.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import re
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import Boolean, Numeric, Select, Text, literal_column, not_, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import engine
+from app.core.invalidation import invalidation_bus
+from app.models.salesforce_record import SalesforceRecord
+from app.models.saved_config import SavedConfig
+
+logger = logging.getLogger(__name__)
+
+# SavedConfig.config_type holding an org's index config. Shape:
+#   {"sobjects": {"Opportunity": {"StageName": "text", "Amount": "numeric"}}}
+INDEX_CONFIG_TYPE = "record_indexes"
+
+FIELD_TYPES = {"text": Text, "numeric": Numeric, "boolean": Boolean}
+FILTER_OPS = {"eq", "ne", "gt", "gte", "lt", "lte", "in", "prefix", "null", "notnull"}
+
+# Salesforce API names: letters, digits, underscores (custom fields end in __c)
+_NAME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9_]{0,79}$")
+
+# Query results, invalidated per (org, sobject) in every process when change events land
+record_query_cache = invalidation_bus.register("records", TTLCache(
+    maxsize=settings.records_cache_size,
+    ttl=settings.records_cache_ttl_seconds,
+))
+
+
+def records_cache_namespace(org_id: uuid.UUID, sobject: str) -> str:
+    return f"records:{org_id}:{sobject}"
+
+
+class RecordQueryError(ValueError):
+    """Raised for malformed filter/sort/cursor input."""
+
+
+@dataclass(frozen=True)
+class FilterClause:
+    field: str
+    op: str
+    value: str | tuple[str, ...] | None
+
+
+@dataclass(frozen=True)
+class SortSpec:
+    field: str | None  # None sorts by record_id only
+    descending: bool = False
+
+
+def validate_name(name: str, kind: str = "field") -> str:
+    if not _NAME_RE.match(name):
+        raise RecordQueryError(f"Invalid {kind} name: {name!r}")
+    return name
+
+
+def field_sql(field: str, field_type: str = "text") -> str:
+    """SQL text for a JSONB field, shared by queries and index DDL so they match."""
+    validate_name(field)
+    if field_type == "text":
+        return f"(data ->> '{field}')"
+    return f"((data ->> '{field}')::{field_type})"
+
+
+def field_expression(field: str, field_type: str = "text") -> ColumnElement:
+    return literal_column(field_sql(field, field_type), type_=FIELD_TYPES[field_type])
+
+
+def coerce_value(raw: str, field_type: str):
+    """Convert a DSL value string to the Python type matching the field expression."""
+    if field_type == "numeric":
+        try:
+            return Decimal(raw)
+        except InvalidOperation:
+            raise RecordQueryError(f"Expected a number, got {raw!r}")
+    if field_type == "boolean":
+        lowered = raw.lower()
+        if lowered not in ("true", "false"):
+            raise RecordQueryError(f"Expected true/false, got {raw!r}")
+        return lowered == "true"
+    return raw
+
+
+# --- DSL parsing ---
+
+
+def parse_filter(raw: str) -> FilterClause:
+    """
+    Parse `Field:op:value`. `in` takes `|`-separated values; `null` and
+    `notnull` take no value.
+    """
+    parts = raw.split(":", 2)
+    if len(parts) < 2:
+        raise RecordQueryError(f"Filter must look like Field:op:value, got {raw!r}")
+
+    field, op = validate_name(parts[0]), parts[1].lower()
+    if op not in FILTER_OPS:
+        raise RecordQueryError(f"Unknown filter operator {op!r}")
+
+    if op in ("null", "notnull"):
+        return FilterClause(field=field, op=op, value=None)
+    if len(parts) != 3:
+        raise RecordQueryError(f"Filter operator {op!r} requires a value")
+    if op == "in":
+        return FilterClause(field=field, op=op, value=tuple(parts[2].split("|")))
+    return FilterClause(field=field, op=op, value=parts[2])
+
+
+def parse_sort(raw: str | None) -> SortSpec:
+    """Parse `Field` or `-Field` (descending)."""
+    if not raw:
+        return SortSpec(field=None)
+    descending = raw.startswith("-")
+    field = raw[1:] if descending else raw
+    return SortSpec(field=validate_name(field), descending=descending)
+
+
+def encode_cursor(value, record_id: str) -> str:
+    if isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps([value, record_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, field_type: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, record_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise RecordQueryError("Invalid cursor")
+    if value is not None:
+        value = coerce_value(str(value).lower() if isinstance(value, bool) else str(value), field_type)
+    return value, str(record_id)
+
+
+# --- Compilation ---
+
+
+def compile_filter(clause: FilterClause, field_type: str) -> ColumnElement:
+    expr = field_expression(clause.field, field_type)
+    op, value = clause.op, clause.value
+
+    if op == "null":
+        return expr.is_(None)
+    if op == "notnull":
+        return expr.is_not(None)
+    if op == "in":
+        return expr.in_([coerce_value(v, field_type) for v in value])
+    if op == "prefix":
+        if field_type != "text":
+            raise RecordQueryError(f"'prefix' only applies to text fields, not {clause.field}")
+        return expr.startswith(value, autoescape=True)
+
+    coerced = coerce_value(value, field_type)
+    if op == "eq":
+        return expr == coerced
+    if op == "ne":
+        return expr != coerced
+    if field_type == "boolean":
+        raise RecordQueryError(f"Operator {op!r} does not apply to boolean field {clause.field}")
+    return {"gt": expr.__gt__, "gte": expr.__ge__, "lt": expr.__lt__, "lte": expr.__le__}[op](coerced)
+
+
+def build_record_query(
+    org_id: uuid.UUID,
+    sobject: str,
+    filters: list[FilterClause],
+    sort: SortSpec,
+    limit: int,
+    cursor: str | None = None,
+    field_types: dict[str, str] | None = None,
+) -> tuple[Select, ColumnElement | None]:
+    """
+    Compile a record query. Returns the statement and the sort expression
+    (selected as `sort_value` so the caller can build the next cursor).
+
+    Ordering follows Postgres defaults (ASC NULLS LAST / DESC NULLS FIRST) with
+    record_id as tiebreaker, so a plain btree on (org_id, sobject, expr, record_id)
+    serves both directions.
+    """
+    field_types = field_types or {}
+    record_id = SalesforceRecord.record_id
+
+    conditions = [
+        SalesforceRecord.org_id == org_id,
+        SalesforceRecord.sobject == sobject,
+        not_(SalesforceRecord.is_deleted),
+    ]
+    conditions += [compile_filter(f, field_types.get(f.field, "text")) for f in filters]
+
+    sort_expr = None
+    if sort.field is None:
+        order_by = [record_id.desc() if sort.descending else record_id.asc()]
+        if cursor:
+            _, last_id = decode_cursor(cursor, "text")
+            conditions.append(record_id < last_id if sort.descending else record_id > last_id)
+        columns = [record_id, SalesforceRecord.data]
+    else:
+        field_type = field_types.get(sort.field, "text")
+        sort_expr = field_expression(sort.field, field_type)
+        if sort.descending:
+            order_by = [sort_expr.desc(), record_id.desc()]
+        else:
+            order_by = [sort_expr.asc(), record_id.asc()]
+
+        if cursor:
+            last_value, last_id = decode_cursor(cursor, field_type)
+            if sort.descending:
+                # NULLS FIRST: nulls page by id, then every non-null row follows
+                if last_value is None:
+                    conditions.append(
+                        or_((sort_expr.is_(None)) & (record_id < last_id), sort_expr.is_not(None))
+                    )
+                else:
+                    conditions.append(tuple_(sort_expr, record_id) < tuple_(last_value, last_id))
+            else:
+                # NULLS LAST: non-null rows by (value, id), then the null tail by id
+                if last_value is None:
+                    conditions.append((sort_expr.is_(None)) & (record_id > last_id))
+                else:
+                    conditions.append(
+                        or_(
+                            tuple_(sort_expr, record_id) > tuple_(last_value, last_id),
+                            sort_expr.is_(None),
+                        )
+                    )
+        columns = [record_id, SalesforceRecord.data, sort_expr.label("sort_value")]
+
+    stmt = select(*columns).where(*conditions).order_by(*order_by).limit(limit + 1)
+    return stmt, sort_expr
+
+
+# --- Index config & on-demand expression indexes ---
+
+
+async def load_index_config(db: AsyncSession, org_id: uuid.UUID) -> dict[str, dict[str, str]]:
+    """
+    Load the org's index config as {sobject: {field: type}}.
+    Invalid entries are skipped with a warning rather than failing queries.
+    """
+    result = await db.execute(
+        select(SavedConfig.config_data)
+        .where(SavedConfig.org_id == org_id, SavedConfig.config_type == INDEX_CONFIG_TYPE)
+        .order_by(SavedConfig.created_at)
+        .limit(1)
+    )
+    config_data = result.scalar_one_or_none() or {}
+
+    config: dict[str, dict[str, str]] = {}
+    for sobject, fields in (config_data.get("sobjects") or {}).items():
+        if not _NAME_RE.match(sobject) or not isinstance(fields, dict):
+            logger.warning("Skipping invalid index config entry for org %s: %r", org_id, sobject)
+            continue
+        config[sobject] = {
+            field: field_type
+            for field, field_type in fields.items()
+            if _NAME_RE.match(field) and field_type in FIELD_TYPES
+        }
+    return config
+
+
+def index_name(sobject: str, field: str, field_type: str) -> str:
+    digest = hashlib.sha1(f"{sobject}.{field}.{field_type}".encode()).hexdigest()[:12]
+    return f"ix_sfrec_{digest}"
+
+
+def index_ddl(sobject: str, field: str, field_type: str) -> str:
+    # sobject stays a leading equality column (not a partial predicate) so the
+    # index still matches when sobject is a bound parameter in a generic plan.
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(sobject, field, field_type)} "
+        f"ON salesforce_records (org_id, sobject, {field_sql(field, field_type)}, record_id) "
+        f"WHERE NOT is_deleted"
+    )
+
+
+_ready_indexes: set[str] = set()
+_index_builds: dict[str, asyncio.Task] = {}
+
+
+async def _build_index(sobject: str, field: str, field_type: str) -> None:
+    name = index_name(sobject, field, field_type)
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            result = await conn.exec_driver_sql(
+                "SELECT i.indisvalid FROM pg_class c "
+                "JOIN pg_index i ON i.indexrelid = c.oid "
+                f"WHERE c.relname = '{name}'"
+            )
+            valid = result.scalar_one_or_none()
+            if valid is False:
+                # Leftover from an interrupted concurrent build
+                await conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            if valid is not True:
+                logger.info("Building expression index %s on %s.%s (%s)", name, sobject, field, field_type)
+                await conn.exec_driver_sql(index_ddl(sobject, field, field_type))
+        _ready_indexes.add(name)
+    except Exception:
+        logger.exception("Failed to build expression index %s", name)
+
+
+def ensure_indexes(sobject: str, fields: dict[str, str]) -> None:
+    """
+    Schedule background builds for any configured index not yet known to exist.
+    Never blocks the calling request.
+    """
+    for field, field_type in fields.items():
+        name = index_name(sobject, field, field_type)
+        if name in _ready_indexes or name in _index_builds:
+            continue
+        task = asyncio.create_task(_build_index(sobject, field, field_type))
+        _index_builds[name] = task
+        task.add_done_callback(lambda _t, n=name: _index_builds.pop(n, None))
@@ -1,12 +1,17 @@
 import hashlib
 import hmac
 import secrets
+import uuid
 from datetime import datetime, timezone
 from urllib.parse import urlencode
 
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import SF_TOKEN_REFRESHES, MetricsTransport
+from app.core.offload import parse_json
+from app.core.shared_cache import SharedCache
+from app.core.timing import span
 
 # Salesforce OAuth endpoints
 SF_AUTH_BASE = "https://login.salesforce.com"
@@ -17,6 +22,45 @@ SF_REVOKE_URL = f"{SF_AUTH_BASE}/services/oauth2/revoke"
 # Scopes we request
 SF_SCOPES = "api refresh_token"
 
+# Shared HTTP client: one connection pool (and TLS sessions) for all Salesforce calls
+_http_client: httpx.AsyncClient | None = None
+_http_transport: httpx.AsyncBaseTransport | None = None
+
+
+def build_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    New AsyncClient whose calls are recorded in Salesforce metrics.
+    Uses the transport passed to init_http_client (e.g. a local stand-in) if any.
+    """
+    transport = _http_transport or httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=settings.salesforce_max_connections,
+            max_keepalive_connections=settings.salesforce_max_connections,
+        )
+    )
+    return httpx.AsyncClient(transport=MetricsTransport(transport), **kwargs)
+
+
+def init_http_client(transport: httpx.AsyncBaseTransport | None = None) -> httpx.AsyncClient:
+    """Create the shared client. Pass a transport to route calls elsewhere (tests, benchmarks)."""
+    global _http_client, _http_transport
+    _http_transport = transport
+    _http_client = build_http_client(timeout=30.0)
+    return _http_client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    if _http_client is None:
+        return init_http_client(_http_transport)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 def generate_oauth_state(org_id: str) -> str:
     """
@@ -75,8 +119,8 @@ async def exchange_code_for_tokens(code: str) -> dict:
     Exchange an authorization code for access + refresh tokens.
     Returns the raw Salesforce token response dict.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
+    with span("sf_oauth_token"):
+        response = await get_http_client().post(
             SF_TOKEN_URL,
             data={
                 "grant_type": "authorization_code",
@@ -87,7 +131,7 @@ async def exchange_code_for_tokens(code: str) -> dict:
             },
         )
         response.raise_for_status()
-        return response.json()
+    return response.json()
 
 
 async def refresh_access_token(refresh_token: str) -> dict:
@@ -95,18 +139,23 @@ async def refresh_access_token(refresh_token: str) -> dict:
     Use a refresh token to get a new access token.
     Returns the raw Salesforce token response dict.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            SF_TOKEN_URL,
-            data={
-                "grant_type": "refresh_token",
-                "refresh_token": refresh_token,
-                "client_id": settings.salesforce_client_id,
-                "client_secret": settings.salesforce_client_secret,
-            },
-        )
-        response.raise_for_status()
-        return response.json()
+    try:
+        with span("sf_token_refresh"):
+            response = await get_http_client().post(
+                SF_TOKEN_URL,
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": refresh_token,
+                    "client_id": settings.salesforce_client_id,
+                    "client_secret": settings.salesforce_client_secret,
+                },
+            )
+            response.raise_for_status()
+    except Exception:
+        SF_TOKEN_REFRESHES.labels("failure").inc()
+        raise
+    SF_TOKEN_REFRESHES.labels("success").inc()
+    return response.json()
 
 
 async def test_salesforce_connection(instance_url: str, access_token: str) -> dict:
@@ -114,36 +163,91 @@ async def test_salesforce_connection(instance_url: str, access_token: str) -> di
     Call the Salesforce versions endpoint to verify the connection is alive.
     Returns org info on success.
     """
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        # Get available API versions
+    client = get_http_client()
+
+    # Get available API versions
+    with span("sf_versions"):
         response = await client.get(
             f"{instance_url}/services/data/",
             headers={"Authorization": f"Bearer {access_token}"},
+            timeout=15.0,
         )
         response.raise_for_status()
-        versions = response.json()
-        latest = versions[-1] if versions else {}
+    versions = response.json()
+    latest = versions[-1] if versions else {}
 
-        # Get org info using the latest API version
-        if latest.get("url"):
+    # Get org info using the latest API version
+    if latest.get("url"):
+        with span("sf_org_query"):
             org_response = await client.get(
                 f"{instance_url}{latest['url']}/query",
                 params={"q": "SELECT Id, Name, OrganizationType FROM Organization LIMIT 1"},
                 headers={"Authorization": f"Bearer {access_token}"},
+                timeout=15.0,
             )
             org_response.raise_for_status()
-            org_data = org_response.json()
-            records = org_data.get("records", [])
-            org_info = records[0] if records else {}
-        else:
-            org_info = {}
-
-        return {
-            "connected": True,
-            "instance_url": instance_url,
-            "api_version": latest.get("version", "unknown"),
-            "org_name": org_info.get("Name"),
-            "org_type": org_info.get("OrganizationType"),
-            "salesforce_org_id": org_info.get("Id"),
-            "tested_at": datetime.now(timezone.utc).isoformat(),
-        }
+        org_data = org_response.json()
+        records = org_data.get("records", [])
+        org_info = records[0] if records else {}
+    else:
+        org_info = {}
+
+    return {
+        "connected": True,
+        "instance_url": instance_url,
+        "api_version": latest.get("version", "unknown"),
+        "org_name": org_info.get("Name"),
+        "org_type": org_info.get("OrganizationType"),
+        "salesforce_org_id": org_info.get("Id"),
+        "tested_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def soql_quote(value: str) -> str:
+    """Quote a string as a SOQL literal, escaping backslashes, quotes and control characters."""
+    escaped = (
+        value.replace("\\", "\\\\")
+        .replace("'", "\\'")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+    return f"'{escaped}'"
+
+
+async def query_salesforce(instance_url: str, access_token: str, soql: str) -> list[dict]:
+    """
+    Run a SOQL query, following nextRecordsUrl until done.
+    Returns all records with the `attributes` metadata stripped.
+    """
+    client = get_http_client()
+    headers = {"Authorization": f"Bearer {access_token}"}
+    with span("sf_query"):
+        response = await client.get(
+            f"{instance_url}/services/data/v{settings.salesforce_api_version}/query",
+            params={"q": soql},
+            headers=headers,
+        )
+        response.raise_for_status()
+    data = await parse_json(response.content)
+    records = data.get("records", [])
+
+    while not data.get("done", True) and data.get("nextRecordsUrl"):
+        with span("sf_query"):
+            response = await client.get(f"{instance_url}{data['nextRecordsUrl']}", headers=headers)
+            response.raise_for_status()
+        data = await parse_json(response.content)
+        records.extend(data.get("records", []))
+
+    return [{k: v for k, v in record.items() if k != "attributes"} for record in records]
+
+
+# Results shared across workers and replicas (app.core.shared_cache), keyed by
+# org; access tokens are never part of a cache key
+soql_cache = SharedCache("soql", ttl=settings.soql_cache_ttl_seconds)
+
+
+@soql_cache.cached(namespace="{org_id}", key=("soql",))
+async def query_org(org_id: uuid.UUID, instance_url: str, access_token: str, soql: str) -> list[dict]:
+    """query_salesforce through the shared SOQL result cache."""
+    return await query_salesforce(instance_url, access_token, soql)
@@ -0,0 +1,102 @@
+"""
+Response serialization fast paths.
+
+FastAPI's default path for a `response_model` route validates the return
+value, dumps it to a tree of Python dicts/lists/strings, and hands that to the
+response class to encode. For large bodies the intermediate tree dominates
+both CPU time and peak memory. The helpers here go from ORM objects (or
+already-built models) straight to JSON bytes inside pydantic-core:
+
+- `model_response(Schema, obj_or_rows)` — one JSON document. ORM objects are
+  read through `from_attributes`, no dicts are built.
+- `NDJSONResponse(rows, Schema)` — newline-delimited JSON, one object per line,
+  streamed in chunks from a list or an async iterator (e.g. `db.stream_scalars`)
+  so the whole body is never held in memory.
+
+Routes that return a Response bypass FastAPI's own serialization, so keep the
+`response_model=` on the decorator for the OpenAPI schema. Everything else
+goes through ORJSONResponse, the app's default response class.
+"""
+
+import functools
+from collections.abc import AsyncIterable, Iterable
+from typing import Any
+
+import orjson
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@functools.cache
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def dump_json(schema: type[BaseModel], content: Any) -> bytes:
+    """Serialize an object, a model, or a list of either to JSON bytes as `schema`."""
+    if isinstance(content, (list, tuple)):
+        adapter = _list_adapter(schema)
+        return adapter.dump_json(adapter.validate_python(content))
+    if not isinstance(content, schema):
+        content = schema.model_validate(content)
+    return content.__pydantic_serializer__.to_json(content)
+
+
+def model_response(
+    schema: type[BaseModel],
+    content: Any,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """A JSON response serialized as `schema` without FastAPI's intermediate dicts."""
+    return Response(dump_json(schema, content), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def wants_ndjson(accept: str | None) -> bool:
+    return accept is not None and NDJSON_MEDIA_TYPE in accept
+
+
+async def _ndjson_chunks(rows: Iterable | AsyncIterable, schema: type[BaseModel] | None, chunk_rows: int):
+    def encode(batch: list) -> bytes:
+        if schema is None:
+            return b"".join(orjson.dumps(row) + b"\n" for row in batch)
+        serializer = schema.__pydantic_serializer__
+        models = _list_adapter(schema).validate_python(batch)
+        return b"".join(serializer.to_json(model) + b"\n" for model in models)
+
+    batch = []
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                yield encode(batch)
+                batch = []
+    else:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                yield encode(batch)
+                batch = []
+    if batch:
+        yield encode(batch)
+
+
+class NDJSONResponse(StreamingResponse):
+    """
+    Stream `rows` as newline-delimited JSON, `chunk_rows` objects per write.
+    Rows are serialized as `schema` if given, otherwise as plain JSON values.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        rows: Iterable | AsyncIterable,
+        schema: type[BaseModel] | None = None,
+        chunk_rows: int = 500,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ):
+        super().__init__(_ndjson_chunks(rows, schema, chunk_rows), status_code=status_code, headers=headers)
@@ -0,0 +1,364 @@
+"""
+Cross-worker result cache: an in-memory tier in front of a shared Postgres
+UNLOGGED table (`cache_entries`).
+
+    soql_cache = SharedCache("soql", ttl=300)
+
+    @soql_cache.cached(namespace="{org_id}", key=("soql",))
+    async def query_org(org_id, instance_url, access_token, soql): ...
+
+    await query_org(org.id, url, token, soql)                 # cached
+    await query_org(org.id, url, token, soql, cache_ttl=60)   # per-call TTL
+    await query_org(org.id, url, token, soql, refresh=True)   # recompute and overwrite
+    await soql_cache.invalidate(db, str(org.id))              # drop a namespace everywhere
+
+Values must be JSON-serializable (they are stored as JSON, zlib-compressed
+from SHARED_CACHE_COMPRESS_MIN_BYTES). A lookup goes:
+
+1. memory tier (per process, at most SHARED_CACHE_MEMORY_TTL_SECONDS old);
+2. the shared table, read on a primary key;
+3. on a miss, a short transaction claims a lease row for the entry (under
+   the "lease:" namespace prefix, expiring after
+   SHARED_CACHE_LOCK_WAIT_SECONDS). The process that gets it computes and
+   writes the value, everyone else polls the table until it appears (or the
+   wait passes, then computes itself). Within a process, concurrent misses
+   for the same entry share one lookup.
+
+No connection is held while computing: the claim and the write are separate
+transactions. `refresh=True` skips the lease and always recomputes.
+
+Invalidation deletes the namespace's rows in the caller's transaction and
+drops it from every process's memory tier through the invalidation bus.
+`CacheSweeper` deletes expired rows and, past SHARED_CACHE_MAX_BYTES, the
+entries that would expire soonest; one process sweeps at a time.
+"""
+
+import asyncio
+import contextlib
+import functools
+import hashlib
+import inspect
+import logging
+import time
+import zlib
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import orjson
+from sqlalchemy import BigInteger, delete, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.invalidation import invalidation_bus
+from app.core.metrics import SHARED_CACHE_EVICTIONS, SHARED_CACHE_LOCK_WAITS, SHARED_CACHE_LOOKUPS
+from app.core.offload import run_cpu_bound
+from app.models.cache_entry import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Arbitrary constant shared by every process ("crm_swep")
+SWEEP_LOCK_KEY = 0x63726D5F73776570
+
+
+def _encode(value: Any) -> tuple[bytes, bool]:
+    raw = orjson.dumps(value)
+    if len(raw) >= settings.shared_cache_compress_min_bytes:
+        return zlib.compress(raw, 1), True
+    return raw, False
+
+
+def _decode(data: bytes, compressed: bool) -> Any:
+    return orjson.loads(zlib.decompress(data) if compressed else data)
+
+
+def _digest(key: Any) -> str:
+    return hashlib.sha256(orjson.dumps(key, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+
+
+def _lease_namespace(full_namespace: str) -> str:
+    return f"lease:{full_namespace}"
+
+
+class _Flight:
+    __slots__ = ("lock", "waiters")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.waiters = 0
+
+
+class SharedCache:
+    def __init__(self, name: str, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.memory = invalidation_bus.register(name, TTLCache(
+            maxsize=settings.shared_cache_memory_size,
+            ttl=settings.shared_cache_memory_ttl_seconds,
+        ))
+        self._inflight: dict[tuple[str, str], _Flight] = {}
+
+    def _full_namespace(self, namespace: str) -> str:
+        return f"{self.name}:{namespace}"
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        key: Any,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+        refresh: bool = False,
+    ) -> Any:
+        """Return the cached value for (namespace, key), computing and storing it on a miss."""
+        ttl = self.ttl if ttl is None else ttl
+        digest = _digest(key)
+        if refresh:
+            SHARED_CACHE_LOOKUPS.labels(self.name, "refresh").inc()
+            return await self._load(namespace, digest, compute, ttl, refresh=True)
+
+        value = self.memory.get(namespace, digest, _MISSING)
+        if value is not _MISSING:
+            SHARED_CACHE_LOOKUPS.labels(self.name, "memory_hit").inc()
+            return value
+
+        # Concurrent misses in this process queue behind one trip to the table,
+        # then find the value in the memory tier
+        flight = self._inflight.get((namespace, digest))
+        if flight is None:
+            flight = self._inflight[(namespace, digest)] = _Flight()
+        flight.waiters += 1
+        try:
+            async with flight.lock:
+                value = self.memory.get(namespace, digest, _MISSING)
+                if value is not _MISSING:
+                    SHARED_CACHE_LOOKUPS.labels(self.name, "memory_hit").inc()
+                    return value
+                return await self._load(namespace, digest, compute, ttl, refresh=False)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                del self._inflight[(namespace, digest)]
+
+    async def _load(
+        self,
+        namespace: str,
+        digest: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        refresh: bool,
+    ) -> Any:
+        claimed = False
+        if not refresh:
+            deadline = time.monotonic() + settings.shared_cache_lock_wait_seconds
+            delay = 0.02
+            waited = False
+            while True:
+                async with async_session_factory() as db:
+                    hit = await self._read(db, namespace, digest)
+                    if hit is not _MISSING:
+                        SHARED_CACHE_LOOKUPS.labels(self.name, "shared_hit").inc()
+                        return hit
+                    claimed = await self._claim(db, namespace, digest)
+                    await db.commit()
+                if claimed or time.monotonic() >= deadline:
+                    break
+                # Someone else is computing this entry; wait for their write
+                if not waited:
+                    waited = True
+                    SHARED_CACHE_LOCK_WAITS.labels(self.name).inc()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.5)
+            SHARED_CACHE_LOOKUPS.labels(self.name, "miss").inc()
+
+        try:
+            value = await compute()
+        except BaseException:
+            if claimed:
+                # Let a waiter take over now rather than when the lease expires
+                with contextlib.suppress(Exception):
+                    async with async_session_factory() as db:
+                        await self._release(db, namespace, digest)
+                        await db.commit()
+            raise
+
+        async with async_session_factory() as db:
+            await self._write(db, namespace, digest, value, ttl)
+            if claimed:
+                await self._release(db, namespace, digest)
+            if refresh:
+                # Other processes may hold the old value in memory
+                await invalidation_bus.publish(db, self.name, namespace)
+            await db.commit()
+        self.memory.set(namespace, digest, value, ttl=min(ttl, self.memory.ttl))
+        return value
+
+    async def _claim(self, db: AsyncSession, namespace: str, digest: str) -> bool:
+        """Take the entry's lease unless another process holds an unexpired one."""
+        stmt = insert(CacheEntry).values(
+            namespace=_lease_namespace(self._full_namespace(namespace)),
+            key=digest,
+            value=b"",
+            compressed=False,
+            size_bytes=0,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=settings.shared_cache_lock_wait_seconds),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheEntry.namespace, CacheEntry.key],
+            set_={"expires_at": stmt.excluded.expires_at, "created_at": func.now()},
+            where=CacheEntry.expires_at <= func.now(),
+        ).returning(CacheEntry.key)
+        return (await db.execute(stmt)).scalar_one_or_none() is not None
+
+    async def _release(self, db: AsyncSession, namespace: str, digest: str) -> None:
+        await db.execute(
+            delete(CacheEntry).where(
+                CacheEntry.namespace == _lease_namespace(self._full_namespace(namespace)),
+                CacheEntry.key == digest,
+            )
+        )
+
+    async def _read(self, db: AsyncSession, namespace: str, digest: str) -> Any:
+        result = await db.execute(
+            select(CacheEntry.value, CacheEntry.compressed, CacheEntry.expires_at).where(
+                CacheEntry.namespace == self._full_namespace(namespace),
+                CacheEntry.key == digest,
+                CacheEntry.expires_at > func.now(),
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return _MISSING
+        value = await run_cpu_bound(_decode, row.value, row.compressed)
+        remaining = (row.expires_at - datetime.now(timezone.utc)).total_seconds()
+        if remaining > 0:
+            self.memory.set(namespace, digest, value, ttl=min(remaining, self.memory.ttl))
+        return value
+
+    async def _write(self, db: AsyncSession, namespace: str, digest: str, value: Any, ttl: float) -> None:
+        data, compressed = await run_cpu_bound(_encode, value)
+        stmt = insert(CacheEntry).values(
+            namespace=self._full_namespace(namespace),
+            key=digest,
+            value=data,
+            compressed=compressed,
+            size_bytes=len(data),
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheEntry.namespace, CacheEntry.key],
+            set_={
+                "value": stmt.excluded.value,
+                "compressed": stmt.excluded.compressed,
+                "size_bytes": stmt.excluded.size_bytes,
+                "expires_at": stmt.excluded.expires_at,
+                "created_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+    async def invalidate(self, db: AsyncSession, namespace: str) -> None:
+        """Drop a namespace from the table (in the caller's transaction) and every memory tier."""
+        await db.execute(delete(CacheEntry).where(CacheEntry.namespace == self._full_namespace(namespace)))
+        await invalidation_bus.publish(db, self.name, namespace)
+
+    def cached(self, namespace: str, key: Sequence[str], ttl: float | None = None):
+        """
+        Cache an async function's result.
+
+        `namespace` is a str.format template over the call's arguments (the
+        unit of invalidation, e.g. "{org_id}"); `key` names the arguments that
+        identify the result within it. Leave credentials out of both. The
+        wrapper also accepts keyword-only `cache_ttl` and `refresh`, and the
+        original function is available as `.uncached`.
+        """
+
+        def decorator(fn):
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args, cache_ttl: float | None = None, refresh: bool = False, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = bound.arguments
+                return await self.get_or_compute(
+                    namespace.format(**arguments),
+                    [fn.__qualname__, *(arguments[name] for name in key)],
+                    lambda: fn(*args, **kwargs),
+                    ttl=cache_ttl if cache_ttl is not None else ttl,
+                    refresh=refresh,
+                )
+
+            wrapper.uncached = fn
+            return wrapper
+
+        return decorator
+
+
+async def sweep() -> tuple[int, int] | None:
+    """
+    Delete expired entries, then the soonest-expiring ones beyond
+    SHARED_CACHE_MAX_BYTES. Returns (expired, evicted), or None if another
+    process is sweeping.
+    """
+    async with async_session_factory() as db:
+        if not (await db.execute(select(func.pg_try_advisory_xact_lock(SWEEP_LOCK_KEY)))).scalar():
+            return None
+
+        expired = (await db.execute(delete(CacheEntry).where(CacheEntry.expires_at <= func.now()))).rowcount
+
+        # Keep the latest-expiring entries that fit in the budget
+        kept_bytes = func.sum(CacheEntry.size_bytes).over(
+            order_by=(CacheEntry.expires_at.desc(), CacheEntry.namespace, CacheEntry.key)
+        )
+        ranked = select(CacheEntry.namespace, CacheEntry.key, kept_bytes.label("kept_bytes")).subquery()
+        evicted = (await db.execute(
+            delete(CacheEntry).where(
+                tuple_(CacheEntry.namespace, CacheEntry.key).in_(
+                    select(ranked.c.namespace, ranked.c.key).where(
+                        ranked.c.kept_bytes > literal(settings.shared_cache_max_bytes, BigInteger)
+                    )
+                )
+            )
+        )).rowcount
+        await db.commit()
+
+    SHARED_CACHE_EVICTIONS.labels("expired").inc(expired)
+    SHARED_CACHE_EVICTIONS.labels("size").inc(evicted)
+    return expired, evicted
+
+
+class CacheSweeper:
+    """Runs `sweep()` every SHARED_CACHE_SWEEP_INTERVAL_SECONDS."""
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.shared_cache_sweep_interval_seconds)
+            try:
+                swept = await sweep()
+                if swept is not None and any(swept):
+                    logger.info("Shared cache sweep: %d expired, %d evicted for size", *swept)
+            except Exception:
+                logger.exception("Shared cache sweep failed")
+
+
+# Process-wide sweeper, started in the app lifespan
+cache_sweeper = CacheSweeper()
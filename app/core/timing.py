@@ -0,0 +1,151 @@
+"""
+Per-request timing breakdown.
+
+Code on the request path wraps interesting sections in `span(name)`:
+
+    with span("decrypt"):
+        token = decrypt_token(ciphertext)
+
+For a sampled request (`TIMING_SAMPLE_RATE`), TimingMiddleware installs a
+SpanRecorder in a contextvar; spans add their durations to it and the totals
+are returned as a `Server-Timing` header and logged as one JSON line on the
+`app.timing` logger. Unsampled requests (and everything outside a request,
+e.g. workers) see no recorder, so `span()` returns a shared no-op and costs
+one contextvar lookup. With a sample rate of 0 the middleware is not
+installed at all.
+"""
+
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+logger = logging.getLogger("app.timing")
+
+
+class SpanRecorder:
+    """Accumulated duration and count per span name for one request."""
+
+    __slots__ = ("spans",)
+
+    def __init__(self):
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def server_timing(self, total: float) -> str:
+        parts = []
+        for name, (seconds, count) in self.spans.items():
+            part = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                part += f';desc="{count}x"'
+            parts.append(part)
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+    def as_dict(self) -> dict:
+        return {
+            name: {"ms": round(seconds * 1000, 2), "count": int(count)}
+            for name, (seconds, count) in self.spans.items()
+        }
+
+
+_recorder: ContextVar[SpanRecorder | None] = ContextVar("span_recorder", default=None)
+
+
+class _Span:
+    __slots__ = ("_recorder", "_name", "_start")
+
+    def __init__(self, recorder: SpanRecorder, name: str):
+        self._recorder = recorder
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self._recorder.add(self._name, time.perf_counter() - self._start)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str) -> _Span | _NoopSpan:
+    """Time a block into the current request's recorder, if it is being sampled."""
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NOOP_SPAN
+    return _Span(recorder, name)
+
+
+def _configure_logger() -> None:
+    # The API process doesn't configure logging (uvicorn only sets up its own
+    # loggers), so give the timing logger a bare JSON-lines handler.
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware that samples requests for span recording. The
+    Server-Timing header reflects spans finished before the response starts;
+    the log line is written after the body is sent and includes everything.
+    """
+
+    def __init__(self, app, sample_rate: float):
+        self.app = app
+        self.sample_rate = sample_rate
+        _configure_logger()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        recorder = SpanRecorder()
+        token = _recorder.set(recorder)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                header = recorder.server_timing(time.perf_counter() - start)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _recorder.reset(token)
+            route = scope.get("route")
+            logger.info(json.dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route.path if route is not None else None,
+                "status": status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "spans": recorder.as_dict(),
+            }))
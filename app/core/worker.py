@@ -0,0 +1,130 @@
+"""
+Job worker pool.
+
+Claims jobs in batches up to its free concurrency, runs them as asyncio
+tasks, and keeps each job's visibility timeout extended while it runs. Idle
+workers sleep until a NOTIFY on the jobs channel (or a slow fallback poll for
+retries whose backoff has elapsed) instead of polling in a tight loop.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import uuid
+
+from app.core import key_rotation  # noqa: F401 — registers the token re-encryption job handler
+from app.core import workflows  # noqa: F401 — registers workflow job handlers
+from app.core.config import settings
+from app.core.jobs import (
+    JOB_HANDLERS,
+    JOBS_CHANNEL,
+    claim_jobs,
+    complete_job,
+    extend_lock,
+    fail_job,
+    job_context,
+)
+from app.core.notify import pg_listener
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    def __init__(self, concurrency: int | None = None):
+        self.concurrency = concurrency or settings.worker_concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._running: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await pg_listener.subscribe(JOBS_CHANNEL, self._on_notify)
+        pg_listener.on_reconnect(self._wakeup.set)
+        self._task = asyncio.create_task(self._run())
+        logger.info("Worker %s started (concurrency=%d)", self.worker_id, self.concurrency)
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Stop claiming, then give in-flight jobs `timeout` seconds to finish."""
+        await pg_listener.unsubscribe(JOBS_CHANNEL, self._on_notify)
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._running:
+            _, pending = await asyncio.wait(self._running, timeout=timeout)
+            for task in pending:
+                # Lock lapses and another worker retries the job
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _on_notify(self, _payload: str) -> None:
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            free = self.concurrency - len(self._running)
+            claimed = []
+            if free > 0:
+                try:
+                    claimed = await claim_jobs(self.worker_id, free)
+                except Exception:
+                    logger.exception("Failed to claim jobs")
+
+            for job in claimed:
+                task = asyncio.create_task(self._execute(job))
+                self._running.add(task)
+                task.add_done_callback(self._job_done)
+
+            # A full batch likely means more work is waiting
+            if claimed and len(claimed) == free:
+                continue
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), settings.job_poll_interval_seconds)
+
+    def _job_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        # A slot freed up; look for more work
+        self._wakeup.set()
+
+    async def _keep_locked(self, job: Job) -> None:
+        interval = settings.job_visibility_timeout_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not await extend_lock(job.id, self.worker_id):
+                logger.warning("Lost lock on job %s", job.id)
+                return
+
+    async def _execute(self, job: Job) -> None:
+        if job.attempts > job.max_attempts:
+            # Lock expired on the final attempt (e.g. the worker crashed)
+            await fail_job(job, self.worker_id, job.last_error or "Exceeded max attempts")
+            return
+
+        handler = JOB_HANDLERS.get(job.kind)
+        if handler is None:
+            await fail_job(job, self.worker_id, f"No handler registered for job kind {job.kind!r}")
+            return
+
+        heartbeat = asyncio.create_task(self._keep_locked(job))
+        try:
+            result = await handler(job_context(job))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status = await fail_job(job, self.worker_id, f"{type(e).__name__}: {e}")
+            if status is None:
+                logger.warning(
+                    "Job %s (%s) attempt %d failed after losing its lock: %s", job.id, job.kind, job.attempts, e
+                )
+            else:
+                logger.warning("Job %s (%s) attempt %d failed -> %s: %s", job.id, job.kind, job.attempts, status, e)
+        else:
+            if not await complete_job(job.id, self.worker_id, result):
+                logger.warning("Job %s (%s) finished after losing its lock; result discarded", job.id, job.kind)
+        finally:
+            heartbeat.cancel()
@@ -0,0 +1,132 @@
+"""
+Workflow execution.
+
+A `config_type="workflow"` SavedConfig lists steps that run in order inside a
+`workflow_run` job:
+
+    {"steps": [{"type": "soql_query", "soql": "SELECT Id FROM Lead WHERE IsConverted = false"},
+               {"type": "refresh_dashboard", "dashboard_id": "<uuid>"}]}
+
+Step implementations register with @workflow_step and return a small
+JSON-serializable result that is collected into the job result.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+
+from httpx import HTTPStatusError
+from sqlalchemy import select
+
+from app.core.connections import load_salesforce_connection, refresh_salesforce_connection
+from app.core.dashboards import DASHBOARD_CONFIG_TYPE, load_dashboard
+from app.core.database import async_session_factory
+from app.core.jobs import JobContext, job_handler
+from app.core.metrics import SF_RETRIES
+from app.core.salesforce import query_salesforce
+from app.models.saved_config import SavedConfig
+
+WORKFLOW_CONFIG_TYPE = "workflow"
+WORKFLOW_JOB_KIND = "workflow_run"
+
+# Steps longer than this would hold a worker slot for too long
+MAX_WAIT_SECONDS = 300
+
+
+class WorkflowError(Exception):
+    """A workflow or one of its steps is invalid or failed."""
+
+
+StepHandler = Callable[[uuid.UUID, dict], Awaitable[dict]]
+
+WORKFLOW_STEPS: dict[str, StepHandler] = {}
+
+
+def workflow_step(step_type: str) -> Callable[[StepHandler], StepHandler]:
+    def decorator(fn: StepHandler) -> StepHandler:
+        WORKFLOW_STEPS[step_type] = fn
+        return fn
+
+    return decorator
+
+
+@workflow_step("soql_query")
+async def _soql_query(org_id: uuid.UUID, step: dict) -> dict:
+    soql = step.get("soql")
+    if not soql:
+        raise WorkflowError("soql_query step requires 'soql'")
+
+    async with async_session_factory() as db:
+        sf_conn = await load_salesforce_connection(db, org_id)
+        if sf_conn is None:
+            raise WorkflowError("No Salesforce connection found for this organization")
+        try:
+            records = await query_salesforce(sf_conn.instance_url, sf_conn.access_token, soql)
+        except HTTPStatusError as e:
+            if e.response.status_code != 401:
+                raise
+            SF_RETRIES.labels("query", "token_expired").inc()
+            sf_conn = await refresh_salesforce_connection(db, sf_conn)
+            await db.commit()
+            records = await query_salesforce(sf_conn.instance_url, sf_conn.access_token, soql)
+
+    return {"count": len(records)}
+
+
+@workflow_step("refresh_dashboard")
+async def _refresh_dashboard(org_id: uuid.UUID, step: dict) -> dict:
+    try:
+        dashboard_id = uuid.UUID(str(step.get("dashboard_id")))
+    except ValueError:
+        raise WorkflowError("refresh_dashboard step requires a valid 'dashboard_id'")
+
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(SavedConfig).where(
+                SavedConfig.id == dashboard_id,
+                SavedConfig.org_id == org_id,
+                SavedConfig.config_type == DASHBOARD_CONFIG_TYPE,
+            )
+        )
+        dashboard = result.scalar_one_or_none()
+    if dashboard is None:
+        raise WorkflowError(f"Dashboard {dashboard_id} not found")
+
+    views = await load_dashboard(dashboard, force=True)
+    return {"widgets": len(views), "errors": sum(1 for v in views if v.result.error)}
+
+
+@workflow_step("wait")
+async def _wait(org_id: uuid.UUID, step: dict) -> dict:
+    seconds = min(float(step.get("seconds", 0)), MAX_WAIT_SECONDS)
+    await asyncio.sleep(seconds)
+    return {"waited": seconds}
+
+
+@job_handler(WORKFLOW_JOB_KIND)
+async def run_workflow(ctx: JobContext) -> dict:
+    """Run every step of a workflow config in order, reporting progress per step."""
+    workflow_id = uuid.UUID(ctx.payload["workflow_id"])
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(SavedConfig).where(
+                SavedConfig.id == workflow_id,
+                SavedConfig.org_id == ctx.org_id,
+                SavedConfig.config_type == WORKFLOW_CONFIG_TYPE,
+            )
+        )
+        workflow = result.scalar_one_or_none()
+    if workflow is None:
+        raise WorkflowError(f"Workflow {workflow_id} not found")
+
+    steps = workflow.config_data.get("steps") or []
+    results = []
+    for index, step in enumerate(steps):
+        handler = WORKFLOW_STEPS.get(step.get("type"))
+        if handler is None:
+            raise WorkflowError(f"Unknown workflow step type {step.get('type')!r} at step {index}")
+        await ctx.report_progress(step=index, total=len(steps), step_type=step["type"])
+        results.append({"type": step["type"], **await handler(ctx.org_id, step)})
+
+    await ctx.report_progress(step=len(steps), total=len(steps))
+    return {"workflow_id": str(workflow_id), "steps": results}
@@ -0,0 +1,21 @@
+import hmac
+
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
+
+
+async def require_admin(
+    x_admin_token: str | None = Header(None, description="Admin API token"),
+) -> None:
+    """Guard for /admin endpoints. 404 while ADMIN_TOKEN is unset, 403 on a wrong token."""
+    if not settings.admin_token:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token",
+        )
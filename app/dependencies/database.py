@@ -3,6 +3,7 @@ from collections.abc import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import async_session_factory
+from app.core.timing import span
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -10,7 +11,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
+            with span("db_commit"):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -4,9 +4,19 @@ from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.timing import span
 from app.dependencies.database import get_db
 from app.models.organization import Organization
 
+# Verified orgs by id; only hits are cached, so a newly created org is found at once
+org_cache = invalidation_bus.register("orgs", TTLCache(
+    maxsize=settings.org_cache_size,
+    ttl=settings.org_cache_ttl_seconds,
+))
+
 
 async def get_org_id(
     x_org_id: str = Header(..., description="Organization ID (UUID)"),
@@ -26,13 +36,20 @@ async def get_verified_org(
     db: AsyncSession = Depends(get_db),
 ) -> Organization:
     """Resolve org_id to a real Organization row. 403 if it doesn't exist."""
-    result = await db.execute(
-        select(Organization).where(Organization.id == org_id)
-    )
+    cached = org_cache.get(str(org_id), "org")
+    if cached is not None:
+        # Attach a copy to this session without re-selecting it
+        return await db.merge(cached, load=False)
+
+    with span("db_org"):
+        result = await db.execute(
+            select(Organization).where(Organization.id == org_id)
+        )
     org = result.scalar_one_or_none()
     if org is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Organization not found or access denied",
         )
+    org_cache.set(str(org_id), "org", org)
     return org
@@ -1,22 +1,89 @@
+import asyncio
+import contextlib
+import logging
+import os
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
 
+from app.core.cdc import CDCManager
 from app.core.config import settings
-from app.core.database import dispose_engine
-from app.routers import auth, orgs, salesforce
+from app.core.database import dispose_engine, ping_database, warm_pool
+from app.core.invalidation import invalidation_bus
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import APP_TIME_TO_READY, BOOT_STARTED_AT, MetricsMiddleware
+from app.core.notify import pg_listener
+from app.core.offload import shutdown_executor
+from app.core.profiling import ProfilingMiddleware
+from app.core.salesforce import close_http_client, get_http_client
+from app.core.shared_cache import cache_sweeper
+from app.core.timing import TimingMiddleware
+from app.core.worker import Worker
+from app.routers import admin, auth, dashboards, jobs, orgs, records, salesforce, workflows
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Open DB pool connections and the Salesforce client, then mark the app ready."""
+    backoff = 0.5
+    while True:
+        try:
+            await warm_pool()
+            break
+        except Exception as e:
+            logger.warning("Database warm-up failed (%s); retrying in %.1fs", e, backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 10.0)
+    get_http_client()
+    app.state.ready = True
+    since_boot = time.time() - BOOT_STARTED_AT
+    APP_TIME_TO_READY.set(since_boot)
+    logger.info("Ready %.0fms after boot", since_boot * 1000)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
-    # Startup
+    # Serve liveness immediately; readiness flips once the pool and HTTP client are warm
+    app.state.ready = False
+    warm_up_task = asyncio.create_task(warm_up(app))
+    if settings.loop_monitor_enabled:
+        await loop_monitor.start()
+    # Keep in-process caches coherent with writes made by other workers
+    await invalidation_bus.start()
+    # Expire and size-bound the shared cache table (one process sweeps at a time)
+    await cache_sweeper.start()
+    # Startup — optional Change Data Capture subscribers
+    app.state.cdc_manager = CDCManager() if settings.cdc_enabled else None
+    if app.state.cdc_manager is not None:
+        await app.state.cdc_manager.start()
+    # Optional in-process job worker pool (otherwise run `python -m app.worker`)
+    app.state.worker = Worker() if settings.worker_in_process else None
+    if app.state.worker is not None:
+        await app.state.worker.start()
     yield
-    # Shutdown — close DB connection pool
+    # Shutdown — stop background tasks, then close DB connection pool
+    warm_up_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await warm_up_task
+    if app.state.worker is not None:
+        await app.state.worker.stop()
+    if app.state.cdc_manager is not None:
+        await app.state.cdc_manager.stop()
+    await close_http_client()
+    await cache_sweeper.stop()
+    await invalidation_bus.stop()
+    await pg_listener.stop()
     await dispose_engine()
+    shutdown_executor()
+    if settings.loop_monitor_enabled:
+        await loop_monitor.stop()
 
 
 app = FastAPI(
@@ -24,6 +91,7 @@ app = FastAPI(
     version=settings.app_version,
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
@@ -35,13 +103,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (not installed unless it can be triggered)
+if settings.admin_token or settings.profile_sample_rate > 0:
+    app.add_middleware(ProfilingMiddleware)
+
+# Sampled per-request span timings (not installed at all when disabled)
+if settings.timing_sample_rate > 0:
+    app.add_middleware(TimingMiddleware, sample_rate=settings.timing_sample_rate)
+
+# Request metrics (outermost, so CORS preflights are counted too)
+app.add_middleware(MetricsMiddleware)
+
 
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Catch-all for unhandled exceptions. Logs the error, returns a clean 500."""
-    # TODO: wire up structured logging
-    print(f"Unhandled exception on {request.method} {request.url.path}: {exc}")
+    logger.exception("Unhandled exception on %s %s", request.method, request.url.path, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
@@ -52,14 +130,53 @@ async def global_exception_handler(request: Request, exc: Exception):
 app.include_router(orgs.router)
 app.include_router(auth.router)
 app.include_router(salesforce.router)
+app.include_router(records.router)
+app.include_router(dashboards.router)
+app.include_router(workflows.router)
+app.include_router(jobs.router)
+app.include_router(admin.router)
 
 
-# Health check
+# Health checks
 @app.get("/health", tags=["system"])
+@app.get("/health/live", tags=["system"])
 async def health_check():
+    """Liveness: the process is up and its event loop is serving requests. No dependencies checked."""
     return {
         "status": "ok",
         "app": settings.app_name,
         "version": settings.app_version,
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
+
+
+@app.get("/health/ready", tags=["system"])
+async def readiness_check(request: Request):
+    """Readiness: DB pool warmed and reachable, Salesforce client initialized. 503 otherwise."""
+    checks = {"warmed_up": request.app.state.ready}
+    try:
+        await asyncio.wait_for(ping_database(), timeout=2.0)
+        checks["database"] = True
+    except Exception:
+        checks["database"] = False
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "checks": checks,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", tags=["system"], include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint (aggregated across workers under gunicorn)."""
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
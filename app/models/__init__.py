@@ -1,6 +1,22 @@
 from app.models.base import Base
+from app.models.cache_entry import CacheEntry
+from app.models.cdc_checkpoint import CdcCheckpoint
+from app.models.dashboard_widget_result import DashboardWidgetResult
+from app.models.job import Job
 from app.models.organization import Organization
 from app.models.salesforce_connection import SalesforceConnection
+from app.models.salesforce_record import SalesforceRecord, SalesforceSyncState
 from app.models.saved_config import SavedConfig
 
-__all__ = ["Base", "Organization", "SalesforceConnection", "SavedConfig"]
+__all__ = [
+    "Base",
+    "CacheEntry",
+    "CdcCheckpoint",
+    "DashboardWidgetResult",
+    "Job",
+    "Organization",
+    "SalesforceConnection",
+    "SalesforceRecord",
+    "SalesforceSyncState",
+    "SavedConfig",
+]
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class CacheEntry(Base):
+    """
+    Shared result cache entry (app.core.shared_cache). The table is UNLOGGED:
+    no WAL, so writes are cheap, and it is truncated after a Postgres crash,
+    which a cache can afford.
+    """
+
+    __tablename__ = "cache_entries"
+    __table_args__ = (
+        Index("ix_cache_entries_expires_at", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    namespace: Mapped[str] = mapped_column(String(255), primary_key=True)  # "<cache>:<namespace>"
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 of the call's key arguments
+    value: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # JSON, zlib-compressed if `compressed`
+    compressed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<CacheEntry namespace={self.namespace} key={self.key}>"
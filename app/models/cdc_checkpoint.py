@@ -0,0 +1,27 @@
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class CdcCheckpoint(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """Last applied Change Data Capture replay id per org and channel."""
+
+    __tablename__ = "cdc_checkpoints"
+    __table_args__ = (
+        UniqueConstraint("org_id", "channel", name="uq_cdc_checkpoints_org_channel"),
+    )
+
+    org_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    channel: Mapped[str] = mapped_column(String(255), nullable=False)  # e.g. "/data/ChangeEvents"
+    replay_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CdcCheckpoint org_id={self.org_id} channel={self.channel} replay_id={self.replay_id}>"
@@ -0,0 +1,43 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class DashboardWidgetResult(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """Materialized result of one dashboard widget, refreshed on expiry."""
+
+    __tablename__ = "dashboard_widget_results"
+    __table_args__ = (
+        UniqueConstraint("dashboard_id", "widget_id", name="uq_dashboard_widget_results_dashboard_widget"),
+    )
+
+    dashboard_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("saved_configs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    org_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    widget_id: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # Hash of the widget definition the result was computed from
+    definition_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    source: Mapped[str] = mapped_column(String(20), nullable=False)  # "soql" or "mirror"
+    rows: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Mirror watermark at compute time; unchanged watermark means the result is still valid
+    source_watermark: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DashboardWidgetResult dashboard_id={self.dashboard_id} widget_id={self.widget_id}>"
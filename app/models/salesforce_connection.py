@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -28,6 +28,12 @@ class SalesforceConnection(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         DateTime(timezone=True), nullable=True
     )
 
+    # Result of the most recent fleet health check (app.core.health_check)
+    last_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_check_status: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    last_check_latency_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_check_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
     # Relationship
     organization = relationship("Organization", back_populates="salesforce_connections")
 
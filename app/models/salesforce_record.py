@@ -0,0 +1,58 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class SalesforceRecord(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """Local mirror of a single Salesforce record, stored as raw JSONB."""
+
+    __tablename__ = "salesforce_records"
+    __table_args__ = (
+        UniqueConstraint("org_id", "sobject", "record_id", name="uq_salesforce_records_org_sobject_record"),
+    )
+
+    org_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sobject: Mapped[str] = mapped_column(String(255), nullable=False)  # e.g. "Opportunity"
+    record_id: Mapped[str] = mapped_column(String(18), nullable=False)  # Salesforce Id
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    system_modstamp: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    def __repr__(self) -> str:
+        return f"<SalesforceRecord {self.sobject}/{self.record_id} org_id={self.org_id}>"
+
+
+class SalesforceSyncState(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    """Per-org, per-sobject sync watermark for the local mirror."""
+
+    __tablename__ = "salesforce_sync_states"
+    __table_args__ = (
+        UniqueConstraint("org_id", "sobject", name="uq_salesforce_sync_states_org_sobject"),
+    )
+
+    org_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sobject: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # Highest SystemModstamp applied to the mirror
+    watermark: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<SalesforceSyncState {self.sobject} org_id={self.org_id} watermark={self.watermark}>"
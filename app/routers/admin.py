@@ -0,0 +1,95 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.health_check import check_all_connections
+from app.core.jobs import enqueue_job
+from app.core.key_rotation import REENCRYPT_JOB_KIND
+from app.core.loop_monitor import loop_monitor
+from app.core.profiling import profile_store
+from app.core.serialization import NDJSONResponse
+from app.dependencies.admin import require_admin
+from app.dependencies.database import get_db
+from app.models.job import Job
+from app.schemas.admin import LoopStallResponse, ProfileSummary
+from app.schemas.job import JobResponse
+from app.schemas.salesforce import ConnectionHealthResult
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles", response_model=list[ProfileSummary])
+async def list_profiles():
+    """Most recent request profiles, newest first."""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: int):
+    """
+    Collapsed stacks for one profiled request, one `frame;frame;frame count`
+    line per stack. Feed to flamegraph.pl or load into speedscope.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found (it may have been evicted from the buffer)",
+        )
+    return PlainTextResponse(profile.collapsed())
+
+
+@router.get("/loop-stalls", response_model=list[LoopStallResponse])
+async def list_loop_stalls():
+    """Recent event loop stalls with the stack that was running, newest first."""
+    return list(reversed(loop_monitor.stalls))
+
+
+@router.post(
+    "/encryption/rotate",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def rotate_encryption_key(db: AsyncSession = Depends(get_db)):
+    """
+    Queue re-encryption of every stored token under the current ENCRYPTION_KEY.
+    The previous key must be listed in ENCRYPTION_RETIRED_KEYS until the job
+    succeeds; poll GET /admin/jobs/{job_id} for progress.
+    """
+    return await enqueue_job(db, kind=REENCRYPT_JOB_KIND)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Any job, including ones not owned by an org."""
+    job = await db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.post(
+    "/salesforce/health-check",
+    response_model=list[ConnectionHealthResult],
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def check_salesforce_connections(
+    concurrency: int = Query(settings.health_check_concurrency, ge=1, le=settings.salesforce_max_connections),
+    org_ids: list[uuid.UUID] = Query(default=[], alias="org_id", description="Repeatable. Defaults to every org"),
+):
+    """
+    Test every Salesforce connection, `concurrency` at a time, refreshing
+    expired tokens along the way. Streams one NDJSON line per connection as
+    checks complete, and records the outcome in the `last_check_*` columns.
+    """
+    return NDJSONResponse(
+        check_all_connections(concurrency, org_ids or None),
+        ConnectionHealthResult,
+        chunk_rows=1,
+    )
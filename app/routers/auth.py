@@ -5,10 +5,13 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.connections import connection_cache_namespace
 from app.core.encryption import encrypt_token
+from app.core.invalidation import invalidation_bus
 from app.core.salesforce import (
     build_authorization_url,
     exchange_code_for_tokens,
+    soql_cache,
     verify_oauth_state,
 )
 from app.dependencies.database import get_db
@@ -116,6 +119,9 @@ async def salesforce_callback(
         db.add(connection)
 
     await db.flush()
+    await invalidation_bus.publish(db, "connections", connection_cache_namespace(org_id))
+    # The org may now point at a different Salesforce org (or different access)
+    await soql_cache.invalidate(db, str(org_id))
 
     # In production, redirect to a frontend success page.
     # For now, return a simple JSON success indicator via redirect.
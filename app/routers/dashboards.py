@@ -0,0 +1,88 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dashboards import (
+    DASHBOARD_CONFIG_TYPE,
+    WidgetDefinitionError,
+    WidgetView,
+    load_dashboard,
+)
+from app.dependencies.database import get_db
+from app.dependencies.org import get_verified_org
+from app.models.organization import Organization
+from app.models.saved_config import SavedConfig
+from app.schemas.dashboard import DashboardResponse, DashboardWidgetResponse
+
+router = APIRouter(prefix="/dashboards", tags=["dashboards"])
+
+
+async def _get_dashboard(dashboard_id: uuid.UUID, org: Organization, db: AsyncSession) -> SavedConfig:
+    result = await db.execute(
+        select(SavedConfig).where(
+            SavedConfig.id == dashboard_id,
+            SavedConfig.org_id == org.id,
+            SavedConfig.config_type == DASHBOARD_CONFIG_TYPE,
+        )
+    )
+    dashboard = result.scalar_one_or_none()
+    if dashboard is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dashboard not found",
+        )
+    return dashboard
+
+
+def _to_response(dashboard: SavedConfig, views: list[WidgetView]) -> DashboardResponse:
+    return DashboardResponse(
+        dashboard_id=dashboard.id,
+        name=dashboard.name,
+        widgets=[
+            DashboardWidgetResponse(
+                widget_id=view.result.widget_id,
+                source=view.result.source,
+                rows=view.result.rows,
+                error=view.result.error,
+                computed_at=view.result.computed_at,
+                expires_at=view.result.expires_at,
+                stale=view.stale,
+            )
+            for view in views
+        ],
+    )
+
+
+@router.get("/{dashboard_id}", response_model=DashboardResponse)
+async def get_dashboard(
+    dashboard_id: uuid.UUID,
+    org: Organization = Depends(get_verified_org),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Return materialized widget results for a dashboard.
+    Expired widgets are returned with `stale: true` and refreshed in the background.
+    """
+    dashboard = await _get_dashboard(dashboard_id, org, db)
+    try:
+        views = await load_dashboard(dashboard)
+    except WidgetDefinitionError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    return _to_response(dashboard, views)
+
+
+@router.post("/{dashboard_id}/refresh", response_model=DashboardResponse)
+async def refresh_dashboard(
+    dashboard_id: uuid.UUID,
+    org: Organization = Depends(get_verified_org),
+    db: AsyncSession = Depends(get_db),
+):
+    """Recompute every widget in the dashboard now."""
+    dashboard = await _get_dashboard(dashboard_id, org, db)
+    try:
+        views = await load_dashboard(dashboard, force=True)
+    except WidgetDefinitionError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    return _to_response(dashboard, views)
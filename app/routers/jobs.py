@@ -0,0 +1,113 @@
+import asyncio
+import contextlib
+import json
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.broadcast import RESYNC, job_progress_hub
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.jobs import TERMINAL_STATUSES
+from app.core.notify import pg_listener
+from app.dependencies.database import get_db
+from app.dependencies.org import get_verified_org
+from app.models.job import Job
+from app.models.organization import Organization
+from app.schemas.job import JobResponse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+async def _get_job(job_id: uuid.UUID, org_id: uuid.UUID, db: AsyncSession) -> Job:
+    result = await db.execute(
+        select(Job).where(Job.id == job_id, Job.org_id == org_id)
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _snapshot(job: Job) -> dict:
+    return {"job_id": str(job.id), "status": job.status, "progress": job.progress}
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: uuid.UUID,
+    org: Organization = Depends(get_verified_org),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a job's status, progress and result."""
+    return await _get_job(job_id, org.id, db)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: uuid.UUID,
+    request: Request,
+    org: Organization = Depends(get_verified_org),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Server-Sent Events stream of job progress (workflow runs, exports, syncs).
+    Sends the current state first, then one `progress` event per update,
+    and closes once the job reaches a terminal status.
+    """
+    job = await _get_job(job_id, org.id, db)
+    key = str(job.id)
+
+    # Subscribe and wait for the listener before taking the snapshot, so no
+    # update falls in between. If the listener is still down, the RESYNC
+    # queued when it connects re-reads the job.
+    queue = await job_progress_hub.subscribe(key)
+    try:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await pg_listener.wait_connected(settings.sse_keepalive_seconds)
+        await db.refresh(job)
+    except BaseException:
+        job_progress_hub.unsubscribe(key, queue)
+        raise
+    snapshot = _snapshot(job)
+
+    async def event_stream():
+        try:
+            yield _sse("progress", snapshot)
+            if snapshot["status"] in TERMINAL_STATUSES:
+                return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.sse_keepalive_seconds)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+
+                if event is RESYNC:
+                    async with async_session_factory() as session:
+                        event = _snapshot(await _get_job(job_id, org.id, session))
+
+                yield _sse("progress", event)
+                if event["status"] in TERMINAL_STATUSES:
+                    return
+        finally:
+            job_progress_hub.unsubscribe(key, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
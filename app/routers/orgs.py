@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.serialization import model_response
 from app.dependencies.database import get_db
 from app.models.organization import Organization
 from app.schemas.organization import OrganizationCreate, OrganizationResponse
@@ -35,7 +36,7 @@ async def create_organization(
     db.add(org)
     await db.flush()
     await db.refresh(org)
-    return org
+    return model_response(OrganizationResponse, org, status_code=status.HTTP_201_CREATED)
 
 
 @router.get(
@@ -56,4 +57,4 @@ async def get_organization(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found",
         )
-    return org
+    return model_response(OrganizationResponse, org)
@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.records import (
+    RecordQueryError,
+    build_record_query,
+    encode_cursor,
+    ensure_indexes,
+    load_index_config,
+    parse_filter,
+    parse_sort,
+    record_query_cache,
+    records_cache_namespace,
+    validate_name,
+)
+from app.core.serialization import NDJSONResponse, wants_ndjson
+from app.dependencies.database import get_db
+from app.dependencies.org import get_verified_org
+from app.models.organization import Organization
+from app.models.salesforce_record import SalesforceSyncState
+from app.schemas.records import RecordQueryResponse
+
+router = APIRouter(prefix="/records", tags=["records"])
+
+
+@router.get("/{sobject}", response_model=RecordQueryResponse)
+async def query_records(
+    sobject: str,
+    filters: list[str] = Query(
+        default=[],
+        alias="filter",
+        description="Repeatable. Field:op:value with op in eq, ne, gt, gte, lt, lte, in (a|b), prefix, null, notnull",
+    ),
+    sort: str | None = Query(None, description="Field to sort by; prefix with '-' for descending"),
+    limit: int = Query(settings.records_default_page_size, ge=1, le=settings.records_max_page_size),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    accept: str | None = Header(None),
+    org: Organization = Depends(get_verified_org),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Query mirrored Salesforce records from Postgres.
+    Uses keyset pagination; freshness is reported via X-Mirror-* headers.
+    With `Accept: application/x-ndjson` the page is streamed one record per
+    line and the next cursor is sent in the X-Next-Cursor header.
+    """
+    try:
+        validate_name(sobject, "sobject")
+        parsed_filters = [parse_filter(f) for f in filters]
+        sort_spec = parse_sort(sort)
+    except RecordQueryError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    sync_result = await db.execute(
+        select(SalesforceSyncState).where(
+            SalesforceSyncState.org_id == org.id,
+            SalesforceSyncState.sobject == sobject,
+        )
+    )
+    sync_state = sync_result.scalar_one_or_none()
+    if sync_state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No local mirror exists for {sobject} in this organization",
+        )
+
+    cache_namespace = records_cache_namespace(org.id, sobject)
+    cache_key = (tuple(parsed_filters), sort_spec, limit, cursor)
+    cached = record_query_cache.get(cache_namespace, cache_key)
+
+    if cached is not None:
+        records, next_cursor = cached
+    else:
+        field_types = (await load_index_config(db, org.id)).get(sobject, {})
+        ensure_indexes(sobject, field_types)
+
+        try:
+            stmt, sort_expr = build_record_query(
+                org_id=org.id,
+                sobject=sobject,
+                filters=parsed_filters,
+                sort=sort_spec,
+                limit=limit,
+                cursor=cursor,
+                field_types=field_types,
+            )
+        except RecordQueryError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        rows = (await db.execute(stmt)).all()
+        page, has_more = rows[:limit], len(rows) > limit
+        records = [row.data for row in page]
+
+        next_cursor = None
+        if has_more:
+            last = page[-1]
+            next_cursor = encode_cursor(last.sort_value if sort_expr is not None else None, last.record_id)
+        record_query_cache.set(cache_namespace, cache_key, (records, next_cursor))
+
+    # Freshness headers
+    headers = {}
+    now = datetime.now(timezone.utc)
+    if sync_state.watermark is not None:
+        headers["X-Mirror-Watermark"] = sync_state.watermark.isoformat()
+    if sync_state.last_synced_at is not None:
+        headers["X-Mirror-Synced-At"] = sync_state.last_synced_at.isoformat()
+        headers["X-Mirror-Age"] = str(int((now - sync_state.last_synced_at).total_seconds()))
+
+    if wants_ndjson(accept):
+        if next_cursor is not None:
+            headers["X-Next-Cursor"] = next_cursor
+        return NDJSONResponse(records, headers=headers)
+
+    # Records are plain JSON already; skip re-validating them through the response model
+    return ORJSONResponse(
+        {"sobject": sobject, "records": records, "count": len(records), "next_cursor": next_cursor},
+        headers=headers,
+    )
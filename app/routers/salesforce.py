@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from httpx import HTTPStatusError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import SF_RETRIES
 from app.core.salesforce import test_salesforce_connection
 from app.dependencies.database import get_db
 from app.dependencies.salesforce import (
@@ -33,6 +34,7 @@ async def test_connection(
     except HTTPStatusError as e:
         if e.response.status_code == 401:
             # Token expired — attempt refresh and retry
+            SF_RETRIES.labels("versions", "token_expired").inc()
             sf_conn = await refresh_and_update_token(sf_conn, db)
             try:
                 result = await test_salesforce_connection(
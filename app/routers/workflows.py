@@ -0,0 +1,50 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jobs import enqueue_job
+from app.core.workflows import WORKFLOW_CONFIG_TYPE, WORKFLOW_JOB_KIND
+from app.dependencies.database import get_db
+from app.dependencies.org import get_verified_org
+from app.models.organization import Organization
+from app.models.saved_config import SavedConfig
+from app.schemas.job import JobResponse
+
+router = APIRouter(prefix="/workflows", tags=["workflows"])
+
+
+@router.post(
+    "/{workflow_id}/run",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def run_workflow(
+    workflow_id: uuid.UUID,
+    org: Organization = Depends(get_verified_org),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue a workflow run. Returns the job immediately;
+    poll GET /jobs/{job_id} for progress.
+    """
+    result = await db.execute(
+        select(SavedConfig.id).where(
+            SavedConfig.id == workflow_id,
+            SavedConfig.org_id == org.id,
+            SavedConfig.config_type == WORKFLOW_CONFIG_TYPE,
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow not found",
+        )
+
+    return await enqueue_job(
+        db,
+        kind=WORKFLOW_JOB_KIND,
+        payload={"workflow_id": str(workflow_id)},
+        org_id=org.id,
+    )
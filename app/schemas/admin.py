@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    id: int
+    method: str
+    path: str
+    route: str | None
+    status: int
+    started_at: datetime
+    duration_ms: float
+    interval_ms: float
+    samples: int
+
+    model_config = {"from_attributes": True}
+
+
+class LoopStallResponse(BaseModel):
+    detected_at: datetime
+    task: str | None
+    stack: list[str]
+    duration_ms: float | None
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,20 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class DashboardWidgetResponse(BaseModel):
+    widget_id: str
+    source: str
+    rows: list[dict]
+    error: str | None
+    computed_at: datetime
+    expires_at: datetime
+    stale: bool = False
+
+
+class DashboardResponse(BaseModel):
+    dashboard_id: uuid.UUID
+    name: str
+    widgets: list[DashboardWidgetResponse]
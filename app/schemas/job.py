@@ -0,0 +1,22 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    id: uuid.UUID
+    org_id: uuid.UUID | None
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    progress: dict | None
+    result: dict | None
+    last_error: str | None
+    finished_at: datetime | None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
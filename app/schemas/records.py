@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class RecordQueryResponse(BaseModel):
+    sobject: str
+    records: list[dict]
+    count: int
+    next_cursor: str | None = None
@@ -21,6 +21,9 @@ class SalesforceConnectionResponse(BaseModel):
     instance_url: str
     salesforce_org_id: str | None
     token_expires_at: datetime | None
+    last_checked_at: datetime | None
+    last_check_status: str | None
+    last_check_latency_ms: float | None
     created_at: datetime
     updated_at: datetime
 
@@ -35,3 +38,16 @@ class SalesforceTestResponse(BaseModel):
     org_type: str | None
     salesforce_org_id: str | None
     tested_at: str
+
+
+class ConnectionHealthResult(BaseModel):
+    """One line of the fleet health check stream."""
+    connection_id: uuid.UUID
+    org_id: uuid.UUID
+    instance_url: str
+    status: str  # ok | auth_failed | error | undecryptable
+    latency_ms: float
+    token_refreshed: bool
+    api_version: str | None = None
+    error: str | None = None
+    checked_at: datetime
@@ -0,0 +1,113 @@
+"""
+Fast-start container entry point.
+
+    python -m app.start                 # check schema, then exec gunicorn
+    python -m app.start -- uvicorn app.main:app --port 8000
+
+Instead of running `alembic upgrade head` on every boot (which imports
+Alembic and every model and opens its own engine), compare the database's
+`alembic_version` with the head revision parsed from the migration files
+using one query on a plain asyncpg connection. Alembic only runs when they
+differ, under a Postgres advisory lock so replicas starting together don't
+race; whoever waits on the lock re-checks and usually finds nothing to do.
+
+The server command is exec'd (replacing this process) with APP_BOOT_STARTED_AT
+set, so the app can report time-to-ready and time-to-first-request.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.start")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+VERSIONS_DIR = REPO_ROOT / "alembic" / "versions"
+DEFAULT_SERVER_COMMAND = [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py"]
+
+# Arbitrary constant shared by every replica ("crm_migr")
+MIGRATION_LOCK_KEY = 0x63726D5F6D696772
+
+_REVISION_RE = re.compile(r"^revision\s*(?::[^=]*)?=\s*['\"]([0-9A-Za-z_]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision\s*(?::[^=]*)?=\s*(.+)$", re.MULTILINE)
+_QUOTED_RE = re.compile(r"['\"]([0-9A-Za-z_]+)['\"]")
+
+
+def head_revisions(versions_dir: Path = VERSIONS_DIR) -> set[str]:
+    """Revisions no other migration builds on, read from the files without importing them."""
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text()
+        match = _REVISION_RE.search(source)
+        if match is None:
+            continue
+        revisions.add(match.group(1))
+        down = _DOWN_REVISION_RE.search(source)
+        if down is not None:
+            parents.update(_QUOTED_RE.findall(down.group(1)))
+    return revisions - parents
+
+
+async def _current_revisions(conn: asyncpg.Connection) -> set[str]:
+    try:
+        rows = await conn.fetch("SELECT version_num FROM alembic_version")
+    except asyncpg.UndefinedTableError:
+        return set()
+    return {row["version_num"] for row in rows}
+
+
+async def _run_alembic() -> None:
+    proc = await asyncio.create_subprocess_exec(sys.executable, "-m", "alembic", "upgrade", "head", cwd=REPO_ROOT)
+    if await proc.wait() != 0:
+        raise RuntimeError("alembic upgrade head failed")
+
+
+async def ensure_schema() -> bool:
+    """Bring the schema to head if needed. Returns True if migrations ran."""
+    heads = head_revisions()
+    conn = await asyncpg.connect(settings.database_url.replace("postgresql+asyncpg://", "postgresql://", 1))
+    try:
+        if heads and await _current_revisions(conn) == heads:
+            return False
+
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+        try:
+            # Another replica may have migrated while we waited for the lock
+            if heads and await _current_revisions(conn) == heads:
+                return False
+            await _run_alembic()
+            return True
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+    finally:
+        await conn.close()
+
+
+def main(argv: list[str]) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    boot_started_at = time.time()
+
+    command = argv[argv.index("--") + 1:] if "--" in argv else DEFAULT_SERVER_COMMAND
+    migrated = asyncio.run(ensure_schema())
+    logger.info(
+        "Schema %s in %.0fms; starting %s",
+        "migrated" if migrated else "already at head",
+        (time.time() - boot_started_at) * 1000,
+        " ".join(command),
+    )
+
+    os.environ["APP_BOOT_STARTED_AT"] = repr(boot_started_at)
+    os.chdir(REPO_ROOT)
+    os.execvp(command[0], command)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,44 @@
+"""
+Standalone worker process entry point.
+
+    python -m app.worker
+
+Runs the job worker pool until SIGINT/SIGTERM, then drains in-flight jobs.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.core.database import dispose_engine
+from app.core.loop_monitor import loop_monitor
+from app.core.notify import pg_listener
+from app.core.offload import shutdown_executor
+from app.core.worker import Worker
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    if settings.loop_monitor_enabled:
+        await loop_monitor.start()
+    worker = Worker()
+    await worker.start()
+    try:
+        await stop.wait()
+    finally:
+        await worker.stop()
+        await pg_listener.stop()
+        await dispose_engine()
+        shutdown_executor()
+        if settings.loop_monitor_enabled:
+            await loop_monitor.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
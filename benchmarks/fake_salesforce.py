@@ -0,0 +1,180 @@
+"""
+In-process Salesforce stand-in.
+
+Implements just enough of the REST API for the app's client code: the OAuth
+token endpoint (authorization_code and refresh_token grants), the versions
+listing, and SOQL query with nextRecordsUrl pagination. Mount it behind
+`httpx.ASGITransport` and pass that to `app.core.salesforce.init_http_client`;
+every host (login.salesforce.com and any instance URL) is served by it.
+
+Latency, 401 and 429 responses can be injected to model a slow or throttling
+org. Access tokens are tracked, so `expire_all_tokens()` forces every client
+through the refresh path.
+"""
+
+import asyncio
+import random
+import secrets
+from dataclasses import dataclass
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+API_VERSION = "62.0"
+INSTANCE_URL = "https://bench.my.salesforce.com"
+
+
+@dataclass
+class FakeSalesforceConfig:
+    latency_seconds: float = 0.05
+    jitter_seconds: float = 0.01
+    rate_401: float = 0.0  # fraction of API calls answered with INVALID_SESSION_ID
+    rate_429: float = 0.0  # fraction of calls answered with REQUEST_LIMIT_EXCEEDED
+    total_records: int = 5000  # rows returned by non-Organization queries
+    page_size: int = 2000
+
+
+class FakeSalesforce:
+    def __init__(self, config: FakeSalesforceConfig | None = None, seed: int | None = None):
+        self.config = config or FakeSalesforceConfig()
+        self._random = random.Random(seed)
+        self._access_tokens: set[str] = set()
+        self._refresh_tokens: set[str] = set()
+        self.calls: dict[str, int] = {}
+        self.app = Starlette(routes=[
+            Route("/services/oauth2/token", self._token, methods=["POST"]),
+            Route("/services/data/", self._versions, methods=["GET"]),
+            Route(f"/services/data/v{API_VERSION}/query", self._query, methods=["GET"]),
+            Route(f"/services/data/v{API_VERSION}/query/{{locator}}", self._query_more, methods=["GET"]),
+        ])
+
+    # --- Token bookkeeping ---
+
+    def issue_tokens(self) -> tuple[str, str]:
+        """Mint an (access_token, refresh_token) pair, e.g. for seeding connections."""
+        access_token = f"00Dfake!{secrets.token_urlsafe(24)}"
+        refresh_token = f"5Aepfake{secrets.token_urlsafe(24)}"
+        self._access_tokens.add(access_token)
+        self._refresh_tokens.add(refresh_token)
+        return access_token, refresh_token
+
+    def expire_all_tokens(self) -> None:
+        self._access_tokens.clear()
+
+    # --- Fault injection ---
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    async def _delay(self) -> None:
+        config = self.config
+        delay = config.latency_seconds + self._random.uniform(-config.jitter_seconds, config.jitter_seconds)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _fault(self, request: Request, check_auth: bool = True) -> JSONResponse | None:
+        if self.config.rate_429 and self._random.random() < self.config.rate_429:
+            self._count("429")
+            return JSONResponse(
+                [{"errorCode": "REQUEST_LIMIT_EXCEEDED", "message": "TotalRequests Limit exceeded."}],
+                status_code=429,
+            )
+        if not check_auth:
+            return None
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        injected = self.config.rate_401 and self._random.random() < self.config.rate_401
+        if injected or token not in self._access_tokens:
+            self._count("401")
+            return JSONResponse(
+                [{"errorCode": "INVALID_SESSION_ID", "message": "Session expired or invalid"}],
+                status_code=401,
+            )
+        return None
+
+    # --- Endpoints ---
+
+    async def _token(self, request: Request) -> JSONResponse:
+        self._count("token")
+        await self._delay()
+        if (fault := self._fault(request, check_auth=False)) is not None:
+            return fault
+
+        form = await request.form()
+        grant_type = form.get("grant_type")
+        if grant_type == "refresh_token":
+            if form.get("refresh_token") not in self._refresh_tokens:
+                return JSONResponse(
+                    {"error": "invalid_grant", "error_description": "expired access/refresh token"},
+                    status_code=400,
+                )
+            access_token = f"00Dfake!{secrets.token_urlsafe(24)}"
+            self._access_tokens.add(access_token)
+            return JSONResponse({"access_token": access_token, "instance_url": INSTANCE_URL, "token_type": "Bearer"})
+        if grant_type == "authorization_code":
+            access_token, refresh_token = self.issue_tokens()
+            return JSONResponse({
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "instance_url": INSTANCE_URL,
+                "id": "https://login.salesforce.com/id/00Dfake000000001/005fake000000001",
+                "token_type": "Bearer",
+            })
+        return JSONResponse({"error": "unsupported_grant_type"}, status_code=400)
+
+    async def _versions(self, request: Request) -> JSONResponse:
+        self._count("versions")
+        await self._delay()
+        if (fault := self._fault(request)) is not None:
+            return fault
+        return JSONResponse([
+            {"label": "Winter '25", "url": f"/services/data/v{API_VERSION}", "version": API_VERSION},
+        ])
+
+    def _page(self, offset: int) -> dict:
+        config = self.config
+        end = min(offset + config.page_size, config.total_records)
+        page = {
+            "totalSize": config.total_records,
+            "done": end >= config.total_records,
+            "records": [
+                {
+                    "attributes": {"type": "Account", "url": f"/services/data/v{API_VERSION}/sobjects/Account/{i}"},
+                    "Id": f"001{i:015d}",
+                    "Name": f"Account {i}",
+                    "AnnualRevenue": i * 1000,
+                }
+                for i in range(offset, end)
+            ],
+        }
+        if not page["done"]:
+            page["nextRecordsUrl"] = f"/services/data/v{API_VERSION}/query/01gfake-{end}"
+        return page
+
+    async def _query(self, request: Request) -> JSONResponse:
+        self._count("query")
+        await self._delay()
+        if (fault := self._fault(request)) is not None:
+            return fault
+        soql = request.query_params.get("q", "")
+        if "FROM Organization" in soql:
+            return JSONResponse({
+                "totalSize": 1,
+                "done": True,
+                "records": [{
+                    "attributes": {"type": "Organization"},
+                    "Id": "00Dfake000000001",
+                    "Name": "Benchmark Org",
+                    "OrganizationType": "Developer Edition",
+                }],
+            })
+        return JSONResponse(self._page(0))
+
+    async def _query_more(self, request: Request) -> JSONResponse:
+        self._count("query")
+        await self._delay()
+        if (fault := self._fault(request)) is not None:
+            return fault
+        offset = int(request.path_params["locator"].rsplit("-", 1)[-1])
+        return JSONResponse(self._page(offset))
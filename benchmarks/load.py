@@ -0,0 +1,126 @@
+"""
+Closed-loop load driver, latency statistics and baseline comparison.
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class LoadResult:
+    latencies: list[float] = field(default_factory=list)  # seconds, successful requests only
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def merge(self, other: "LoadResult") -> None:
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        self.elapsed += other.elapsed
+
+
+@dataclass
+class Summary:
+    requests: int
+    concurrency: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+    error_rate: float
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return math.nan
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def summarize(result: LoadResult, concurrency: int) -> Summary:
+    latencies = sorted(result.latencies)
+    total = len(latencies) + result.errors
+    return Summary(
+        requests=total,
+        concurrency=concurrency,
+        p50_ms=round(percentile(latencies, 50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 99) * 1000, 2),
+        throughput_rps=round(len(latencies) / result.elapsed, 1) if result.elapsed else 0.0,
+        error_rate=round(result.errors / total, 4) if total else 0.0,
+    )
+
+
+async def run_load(
+    request: Callable[[int], Awaitable[bool]],
+    total: int,
+    concurrency: int,
+) -> LoadResult:
+    """
+    Issue `total` calls of `request(i)` from `concurrency` concurrent clients.
+    `request` returns whether the call succeeded; exceptions count as errors.
+    """
+    result = LoadResult()
+    next_index = 0
+
+    async def client() -> None:
+        nonlocal next_index
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                ok = await request(i)
+            except Exception:
+                ok = False
+            if ok:
+                result.latencies.append(time.perf_counter() - start)
+            else:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(concurrency, total))))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+# --- Baselines ---
+
+
+def load_baseline(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, summaries: dict[str, Summary]) -> None:
+    baseline = load_baseline(path)
+    baseline.update({name: asdict(summary) for name, summary in summaries.items()})
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def compare(name: str, summary: Summary, baseline: dict, tolerance: float) -> list[str]:
+    """Return human-readable regressions of `summary` against a stored baseline entry."""
+    if (baseline["requests"], baseline["concurrency"]) != (summary.requests, summary.concurrency):
+        return [
+            f"{name}: baseline was recorded with requests={baseline['requests']} "
+            f"concurrency={baseline['concurrency']}; re-record it with --update-baseline"
+        ]
+
+    regressions = []
+    for metric in ("p50_ms", "p95_ms", "p99_ms"):
+        limit = baseline[metric] * (1 + tolerance)
+        if getattr(summary, metric) > limit:
+            regressions.append(f"{name}: {metric} {getattr(summary, metric)} > {limit:.2f} (baseline {baseline[metric]})")
+    floor = baseline["throughput_rps"] * (1 - tolerance)
+    if summary.throughput_rps < floor:
+        regressions.append(f"{name}: throughput_rps {summary.throughput_rps} < {floor:.1f} (baseline {baseline['throughput_rps']})")
+    # Absolute slack: error rates are often 0 in the baseline
+    if summary.error_rate > baseline["error_rate"] + 0.01:
+        regressions.append(f"{name}: error_rate {summary.error_rate} > baseline {baseline['error_rate']}")
+    return regressions
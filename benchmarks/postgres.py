@@ -0,0 +1,66 @@
+"""
+Throwaway Postgres database for benchmark runs.
+
+Creates a uniquely named database on the server given by an admin URL, runs
+`alembic upgrade head` against it in a subprocess (exactly as a deploy does),
+and drops it afterwards.
+"""
+
+import asyncio
+import os
+import secrets
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def migrate(database_url: str) -> None:
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "alembic", "upgrade", "head",
+        cwd=REPO_ROOT,
+        env={**os.environ, "DATABASE_URL": database_url},
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    output, _ = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"alembic upgrade head failed:\n{output.decode(errors='replace')}")
+
+
+@asynccontextmanager
+async def postgres_database(admin_url: str, keep: bool = False) -> AsyncIterator[str]:
+    """
+    Yield the SQLAlchemy URL (postgresql+asyncpg://) of a fresh, migrated
+    database. `admin_url` must point at a role allowed to CREATE DATABASE.
+    """
+    name = f"crm_bench_{os.getpid()}_{secrets.token_hex(3)}"
+    admin_dsn = _asyncpg_dsn(admin_url)
+
+    conn = await asyncpg.connect(admin_dsn)
+    try:
+        await conn.execute(f'CREATE DATABASE "{name}"')
+    finally:
+        await conn.close()
+
+    url = make_url(admin_url).set(drivername="postgresql+asyncpg", database=name)
+    database_url = url.render_as_string(hide_password=False)
+    try:
+        await migrate(database_url)
+        yield database_url
+    finally:
+        if not keep:
+            conn = await asyncpg.connect(admin_dsn)
+            try:
+                await conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+            finally:
+                await conn.close()
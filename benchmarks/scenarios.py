@@ -0,0 +1,112 @@
+"""
+Benchmark scenarios.
+
+Each scenario seeds what it needs, drives the app in-process through
+`httpx.ASGITransport`, and returns a LoadResult. Importing this module
+imports the app, so DATABASE_URL must already point at the benchmark
+database (see benchmarks.run).
+"""
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+
+from app.core.database import async_session_factory
+from app.core.encryption import encrypt_token
+from app.main import app
+from app.models.organization import Organization
+from app.models.salesforce_connection import SalesforceConnection
+from benchmarks.fake_salesforce import INSTANCE_URL, FakeSalesforce
+from benchmarks.load import LoadResult, run_load
+
+
+@dataclass
+class BenchContext:
+    client: httpx.AsyncClient
+    fake: FakeSalesforce
+    run_id: str
+
+
+def app_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60.0)
+
+
+async def seed_connected_orgs(ctx: BenchContext, count: int) -> list[uuid.UUID]:
+    """Create `count` orgs, each with a Salesforce connection holding live fake tokens."""
+    org_ids = []
+    async with async_session_factory() as db:
+        for i in range(count):
+            org = Organization(name=f"Bench {ctx.run_id} {i}", slug=f"bench-{ctx.run_id}-seed-{i}")
+            db.add(org)
+            await db.flush()
+            access_token, refresh_token = ctx.fake.issue_tokens()
+            db.add(SalesforceConnection(
+                org_id=org.id,
+                access_token=encrypt_token(access_token),
+                refresh_token=encrypt_token(refresh_token),
+                instance_url=INSTANCE_URL,
+            ))
+            org_ids.append(org.id)
+        await db.commit()
+    return org_ids
+
+
+async def salesforce_test(ctx: BenchContext, requests: int, concurrency: int) -> LoadResult:
+    """GET /salesforce/test spread over a pool of connected orgs."""
+    org_ids = await seed_connected_orgs(ctx, max(concurrency, 1))
+
+    async def request(i: int) -> bool:
+        response = await ctx.client.get("/salesforce/test", headers={"X-Org-ID": str(org_ids[i % len(org_ids)])})
+        return response.status_code == 200
+
+    return await run_load(request, requests, concurrency)
+
+
+async def token_refresh_storm(ctx: BenchContext, requests: int, concurrency: int) -> LoadResult:
+    """
+    Every access token expires at once, then `concurrency` requests hit a few
+    orgs simultaneously, so several requests per org race to refresh and
+    update the same connection row. Repeats until `requests` are issued.
+    """
+    org_ids = await seed_connected_orgs(ctx, max(concurrency // 5, 1))
+
+    async def request(i: int) -> bool:
+        response = await ctx.client.get("/salesforce/test", headers={"X-Org-ID": str(org_ids[i % len(org_ids)])})
+        return response.status_code == 200
+
+    result = LoadResult()
+    remaining = requests
+    while remaining > 0:
+        burst = min(concurrency, remaining)
+        ctx.fake.expire_all_tokens()
+        result.merge(await run_load(request, burst, burst))
+        remaining -= burst
+    return result
+
+
+async def org_creation_burst(ctx: BenchContext, requests: int, concurrency: int) -> LoadResult:
+    """POST /orgs with unique slugs as fast as the app accepts them."""
+
+    async def request(i: int) -> bool:
+        response = await ctx.client.post(
+            "/orgs",
+            json={"name": f"Burst {i}", "slug": f"bench-{ctx.run_id}-burst-{i}"},
+        )
+        return response.status_code == 201
+
+    return await run_load(request, requests, concurrency)
+
+
+SCENARIOS: dict[str, Callable[[BenchContext, int, int], Awaitable[LoadResult]]] = {
+    "salesforce_test": salesforce_test,
+    "token_refresh_storm": token_refresh_storm,
+    "org_creation_burst": org_creation_burst,
+}
+
+
+async def warm_up(ctx: BenchContext) -> None:
+    """Open pool connections and exercise lazy code paths before measuring."""
+    await asyncio.gather(*(ctx.client.get(f"/orgs/{uuid.uuid4()}") for _ in range(5)))
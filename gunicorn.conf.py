@@ -0,0 +1,60 @@
+"""
+Gunicorn settings for multi-process serving.
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+One Uvicorn worker per available CPU (honouring container CPU quotas), or
+WEB_CONCURRENCY if set. The app is imported once in the master and forked,
+so workers start fast and share read-only memory; each worker runs its own
+lifespan (DB pool, LISTEN connection, loop monitor) after the fork.
+"""
+
+import math
+import os
+import shutil
+
+
+def available_cpus() -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    # cgroup v2 quota, e.g. "200000 100000" for 2 CPUs or "max 100000" for unlimited
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+# Multi-process Prometheus metrics: start from an empty directory. This runs
+# when gunicorn reads its config, before the preloaded app creates any metric
+# (on_starting would be too late: preload imports the app first)
+_multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if _multiproc_dir:
+    shutil.rmtree(_multiproc_dir, ignore_errors=True)
+    os.makedirs(_multiproc_dir, exist_ok=True)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY") or available_cpus())
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    # Never share pooled connections across processes (the master shouldn't
+    # have opened any, but preloading makes it possible)
+    from app.core.database import engine
+
+    engine.sync_engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)